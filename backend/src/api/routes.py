@@ -1,17 +1,13 @@
+import asyncio
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional, List
-import uuid
-from git import Repo
 from fastapi import APIRouter, Form, HTTPException, Depends, UploadFile, File, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse, StreamingResponse
-from qdrant_client import QdrantClient
 from git_repo_parser.stats_parser import StatsParser
 from vector_store.chunk_store import ChunkStoreHandler
 from vector_store.retrive_generate import ChatLLM
-from config.config import QDRANT_HOST, QDRANT_API_KEY
 import json
-import os
 from .utils import *
 import traceback
 from config.logging_config import start_log_request, info, warning, debug, error
@@ -101,7 +97,7 @@ async def extract_repository(user_session: UserSessionID):
     try:
         info(f"Extracting repository for user {user_session.user_id}, session {user_session.session_id}")
         project_path = get_project_path(user_session.user_id, user_session.session_id)
-        if not os.path.exists(project_path):
+        if not project_paths.exists(project_path):
             warning(f"Project path not available: {project_path}")
             raise HTTPException(status_code=400, detail="project Not Avilable")
         
@@ -150,12 +146,13 @@ async def session_delete(user_session: UserSessionID):
         info(f"Deleting session {user_session.session_id} for user {user_session.user_id}")
         project_path = get_project_path(user_session.user_id, user_session.session_id) 
 
-        if not os.path.exists(project_path):
+        if not project_paths.exists(project_path):
             warning(f"Project path not available: {project_path}")
             raise HTTPException(status_code=400, detail="project Not Avilable")
         
         info("Deleting repository folder")
         git_clone_service.folder_delete(user_session.user_id, user_session.session_id)
+        project_paths.discard(project_path)
         
         info("Deleting session from DynamoDB")
         await dynamo_db_service.delete_session(user_session.user_id, user_session.session_id)
@@ -198,7 +195,7 @@ async def analyze_repository(user_session: UserSessionID):
         
         info(f"Generating new stats for session {user_session.session_id}")
         project_path = get_project_path(user_session.user_id, user_session.session_id)
-        if not os.path.exists(project_path):
+        if not project_paths.exists(project_path):
             warning(f"Project path not available: {project_path}")
             raise HTTPException(status_code=400, detail="project Not Avilable")
         
@@ -214,7 +211,11 @@ async def analyze_repository(user_session: UserSessionID):
 
 
 @router.post("/query")
-async def query_code(request: QueryRequest, llm: ChatLLM = Depends(lambda: get_llm("azure"))):
+async def query_code(
+    request: QueryRequest,
+    llm: ChatLLM = Depends(lambda: get_llm("azure")),
+    evaluator: Evaluator = Depends(get_evaluator)
+):
     """
     Endpoint for regular queries.
 
@@ -229,12 +230,12 @@ async def query_code(request: QueryRequest, llm: ChatLLM = Depends(lambda: get_l
         info(f"Processing query for user {request.user_id}, session {request.session_id}")
         project_path = get_project_path(request.user_id, request.session_id) 
 
-        if not os.path.exists(project_path):
+        if not project_paths.exists(project_path):
             warning(f"Project path not available: {project_path}")
             raise HTTPException(status_code=400, detail="project Not Avilable")
 
         info("Initializing chunk store handler")
-        collection_info = ChunkStoreHandler(project_path, request.user_id, request.session_id)
+        collection_info = get_chunk_store(project_path, request.user_id, request.session_id)
         
         info("Invoking LLM for query")
         contexts, response = await llm.invoke(
@@ -249,7 +250,7 @@ async def query_code(request: QueryRequest, llm: ChatLLM = Depends(lambda: get_l
         )
         
         info("Evaluating response quality")
-        evaluation_metrics = evaluator.evaluate(
+        evaluation_metrics = await evaluator.aevaluate(
             use_llm=request.use_llm == "True",
             request=request.query,
             contexts=contexts,
@@ -273,7 +274,8 @@ async def query_code(request: QueryRequest, llm: ChatLLM = Depends(lambda: get_l
 @router.websocket("/query/stream")
 async def query_code_stream_ws(
     websocket: WebSocket,
-    llm: ChatLLM = Depends(lambda: get_llm("azure"))
+    llm: ChatLLM = Depends(lambda: get_llm("azure")),
+    evaluator: Evaluator = Depends(get_evaluator)
 ):
     """
     WebSocket endpoint for streaming queries with evaluation metrics.
@@ -313,14 +315,14 @@ async def query_code_stream_ws(
         
         project_path = get_project_path(request.user_id, request.session_id) 
 
-        if not os.path.exists(project_path):
+        if not project_paths.exists(project_path):
             warning(f"Project path not available: {project_path}")
             await send_json_with_custom_encoder({"error": "Project Not Available"})
             await websocket.close()
             return
         
         info("Initializing chunk store handler")
-        collection_info = ChunkStoreHandler(project_path, request.user_id, request.session_id)
+        collection_info = get_chunk_store(project_path, request.user_id, request.session_id)
         
         complete_response = []
         last_contexts = None
@@ -375,12 +377,11 @@ async def query_code_stream_ws(
                         "metric": None
                     })
 
-                    import asyncio
                     await asyncio.sleep(0.02)
 
             info("Stream complete, performing evaluation")
             full_response = "".join(complete_response)
-            evaluation_metrics = evaluator.evaluate(
+            evaluation_metrics = await evaluator.aevaluate(
                 use_llm=request.use_llm == "True",
                 request=request.query,
                 contexts=last_contexts,
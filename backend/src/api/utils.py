@@ -1,12 +1,14 @@
 from datetime import datetime
 import json
 import shutil
-from typing import Any, List, Dict
+import time
+from typing import Any, Iterable, Iterator, List, Dict, Tuple
 import uuid
+from functools import lru_cache
 from fastapi import HTTPException, logger
 from git import Repo
 from pydantic import BaseModel
-from git_repo_parser.base_parser import CodeParser
+from git_repo_parser.base_parser import CodeParser, ParseSummary
 from vector_store.chunk_store import ChunkStoreHandler
 from vector_store.retrive_generate import ChatLLM
 from chunking.document_chunks import DocumentChunker
@@ -137,7 +139,32 @@ class GitCloneService:
             info("Folder deleted successfully after permission changes")
             
         
+class ProjectPathCache:
+    """Remembers project paths that were recently confirmed to exist"""
+    
+    def __init__(self, ttl: float = 5.0):
+        self.ttl = ttl
+        self._checked_at: Dict[str, float] = {}
+    
+    def exists(self, path: str) -> bool:
+        """Check a path, hitting the filesystem at most once per TTL window"""
+        checked_at = self._checked_at.get(path)
+        if checked_at is not None and time.monotonic() - checked_at < self.ttl:
+            return True
+        if os.path.exists(path):
+            self._checked_at[path] = time.monotonic()
+            return True
+        self._checked_at.pop(path, None)
+        return False
+    
+    def discard(self, path: str):
+        """Forget a path, e.g. after its project folder is deleted"""
+        self._checked_at.pop(path, None)
+            
+        
 class RepositoryStorageService:
+    STORE_BATCH_SIZE = 512
+    
     def __init__(self):
         self.code_parser = CodeParser()
         self.doc_chunker = DocumentChunker()
@@ -152,36 +179,52 @@ class RepositoryStorageService:
             error(f"Failed to initialize chunk store: {str(e)}")
             raise Exception(f"Failed to initialize chunk store: {str(e)}")
 
-    def _process_code_chunks(self, repo_path: str) -> List[Dict]:
-        """Process and parse code files"""
-        try:
-            info(f"Processing code files in {repo_path}")
-            code_chunks = self.code_parser.parse_directory(repo_path)
-            info(f"Processed {len(code_chunks)} code chunks")
-            return code_chunks
-        except Exception as e:
-            error(f"Failed to process code files: {str(e)}")
-            raise Exception(f"Failed to process code files: {str(e)}")
+    def _process_code_chunks(self, repo_path: str) -> Iterator[Tuple[str, Dict]]:
+        """Lazily process and parse code files"""
+        info(f"Processing code files in {repo_path}")
+        return self.code_parser.iter_directory(repo_path)
 
-    def _process_doc_chunks(self, repo_path: str) -> List[Dict]:
-        """Process and parse document files"""
-        try:
-            info(f"Processing document files in {repo_path}")
-            doc_chunks = self.doc_chunker.parse_directory(repo_path)
-            info(f"Processed {len(doc_chunks)} document chunks")
-            return doc_chunks
-        except Exception as e:
-            error(f"Failed to process document files: {str(e)}")
-            raise Exception(f"Failed to process document files: {str(e)}")
+    def _process_doc_chunks(self, repo_path: str) -> Iterator[Tuple[str, Dict]]:
+        """Lazily process and parse document files"""
+        info(f"Processing document files in {repo_path}")
+        return self.doc_chunker.iter_directory(repo_path)
 
     def _store_chunks(self, chunk_store, 
-                     chunks: List[Dict]) -> bool:
-        """Store chunks in vector database"""
+                     chunks: Iterable[Tuple[str, Dict]],
+                     summary: Optional[ParseSummary] = None) -> bool:
+        """Store chunks in vector database, flushing every STORE_BATCH_SIZE chunks"""
         try:
-            info(f"Storing {len(chunks)} chunks in vector database")
-            result = chunk_store.store_chunks(chunks)
-            info(f"Chunks stored successfully")
-            return result
+            batch = {}
+            batch_size = 0
+            stored_files = 0
+            success = True
+            flushed = False
+            for file_path, file_data in chunks:
+                if summary is not None:
+                    summary.add(file_data)
+                batch[file_path] = file_data
+                batch_size += len(file_data.get('chunks', []))
+                if batch_size >= self.STORE_BATCH_SIZE:
+                    info(f"Storing {batch_size} chunks from {len(batch)} files in vector database")
+                    success = chunk_store.store_chunks(batch) and success
+                    flushed = True
+                    stored_files += len(batch)
+                    batch = {}
+                    batch_size = 0
+            
+            if summary is not None:
+                batch['summary'] = summary.to_dict()
+            if batch:
+                info(f"Storing {batch_size} chunks from {len(batch)} files in vector database")
+                success = chunk_store.store_chunks(batch) and success
+                flushed = True
+                stored_files += len(batch)
+            
+            if not flushed:
+                warning("No chunks found to store")
+                return False
+            info(f"Chunks stored successfully for {stored_files} files")
+            return success
         except Exception as e:
             error(f"Failed to store chunks: {str(e)}")
             raise Exception(f"Failed to store chunks: {str(e)}")
@@ -192,23 +235,13 @@ class RepositoryStorageService:
             info(f"Processing repository {repo_path} for user {user_id}, session {session_id}")
             chunk_store = self._create_chunk_store(repo_path, user_id, session_id)
 
-            code_chunks = self._process_code_chunks(repo_path)
-            doc_chunks = self._process_doc_chunks(repo_path)
-
-            success_code = False
-            success_doc = False
-            
-            if code_chunks:
-                info(f"Storing {len(code_chunks)} code chunks")
-                success_code = self._store_chunks(chunk_store, code_chunks)
-            else:
-                warning("No code chunks found to store")
-                
-            if doc_chunks:
-                info(f"Storing {len(doc_chunks)} document chunks")
-                success_doc = self._store_chunks(chunk_store, doc_chunks)
-            else:
-                warning("No document chunks found to store")
+            # Parsed files are streamed into the vector store batch by batch
+            info("Storing code chunks")
+            success_code = self._store_chunks(
+                chunk_store, self._process_code_chunks(repo_path), ParseSummary()
+            )
+            info("Storing document chunks")
+            success_doc = self._store_chunks(chunk_store, self._process_doc_chunks(repo_path))
     
             if not success_code and not success_doc:
                 warning("Failed to store any chunks, repository may be empty")
@@ -224,9 +257,10 @@ class RepositoryStorageService:
             raise Exception(f"Repository processing failed: {str(e)}")
 
 
+@lru_cache(maxsize=None)
 def get_llm(provider_type: Optional[str] = None) -> ChatLLM:
     """
-    Create ChatLLM instance for the specified provider.
+    Create ChatLLM instance for the specified provider, reused across requests.
     
     Args:
         provider_type: Type of LLM provider to use ("openai", "azure", or "claude")
@@ -271,13 +305,19 @@ def get_llm(provider_type: Optional[str] = None) -> ChatLLM:
         return ChatLLM(
             provider=provider,
             qdrant_url=QDRANT_HOST,
-            qdrant_api_key=QDRANT_API_KEY
+            qdrant_api_key=QDRANT_API_KEY,
+            dynamo_db=dynamo_db_service
         )
         
     except Exception as e:
         error(f"Failed to create LLM instance: {str(e)}")
         raise
     
+@lru_cache(maxsize=128)
+def get_chunk_store(project_path: str, user_id: str, session_id: str) -> ChunkStoreHandler:
+    """Return a cached ChunkStoreHandler for the session's collection"""
+    return ChunkStoreHandler(project_path, user_id, session_id)
+
 def get_project_path(user_id: str, session_id: str):
     
     try:
@@ -292,12 +332,37 @@ def get_project_path(user_id: str, session_id: str):
         error(f"Project path not found for user {user_id}, session {session_id}")
         raise HTTPException(status_code=404, detail="Project File Not found")
     
-def follow_up_question(question: str):
-    info(f"Generating follow-up questions for: {question}")
-    provider = OpenAIProvider(
+@lru_cache(maxsize=None)
+def get_evaluator() -> Evaluator:
+    """Create the shared Evaluator on first use"""
+    evaluator = Evaluator(
+        llm_metrics=[
+            LLMMetricType.ANSWER_RELEVANCY,
+            LLMMetricType.FAITHFULNESS,
+            LLMMetricType.CONTEXT_RELEVANCY
+        ],
+        non_llm_metrics=[
+            NonLLMMetricType.CONTEXT_QUERY_MATCH,
+            NonLLMMetricType.INFORMATION_DENSITY,
+            NonLLMMetricType.ANSWER_COVERAGE,
+            NonLLMMetricType.RESPONSE_CONSISTENCY,
+            NonLLMMetricType.SOURCE_DIVERSITY,
+        ]
+    )
+    info("Evaluator initialized with metrics")
+    return evaluator
+    
+@lru_cache(maxsize=None)
+def get_follow_up_provider() -> OpenAIProvider:
+    """Create the provider used for follow-up questions on first use"""
+    return OpenAIProvider(
             api_key=OPENAI_API_KEY,
             model="gpt-4o-mini"
         )
+    
+def follow_up_question(question: str):
+    info(f"Generating follow-up questions for: {question}")
+    provider = get_follow_up_provider()
     messages = [
         {"role": "system", "content": "You are a helpful assistant that generates exactly 3 relevant follow-up questions based on an input question. Return ONLY the three questions as a numbered list (1, 2, 3). Do not include any other text."},
         {"role": "user", "content": f"Generate 3 follow-up questions for this question: {question}"}
@@ -320,21 +385,6 @@ def follow_up_question(question: str):
 # Initialize service
 repo_service = RepositoryStorageService()
 git_clone_service = GitCloneService()
-evaluator = Evaluator(
-    llm_metrics=[
-        LLMMetricType.ANSWER_RELEVANCY,
-        LLMMetricType.FAITHFULNESS,
-        LLMMetricType.CONTEXT_RELEVANCY
-    ],
-    non_llm_metrics=[
-        NonLLMMetricType.CONTEXT_QUERY_MATCH,
-        NonLLMMetricType.INFORMATION_DENSITY,
-        NonLLMMetricType.ANSWER_COVERAGE,
-        NonLLMMetricType.RESPONSE_CONSISTENCY,
-        NonLLMMetricType.SOURCE_DIVERSITY,
-    ]
-)
-info("Evaluator initialized with metrics")
-
+project_paths = ProjectPathCache()
 dynamo_db_service = DynamoDBManager()
 info("DynamoDB manager initialized")
\ No newline at end of file
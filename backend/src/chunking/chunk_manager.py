@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Optional
 import logging
 from config.logging_config import info, warning, debug, error
 
@@ -9,6 +9,16 @@ from .language_specific_chunk.java_chunker import JavaChunker
 
 class ChunkManager:
     """Manages code chunking across different languages"""
+    
+    __slots__ = ('logger', 'parsers', 'chunkers', '_lang_by_ext')
+    
+    LANGUAGE_MAPPING = (
+        ('.py', 'python', PythonChunker),
+        ('.js', 'javascript', JavaScriptChunker),
+        ('.java', 'java', JavaChunker),
+        ('.ts', 'typescript', TypeScriptChunker),
+        ('.tsx', 'typescript', TypeScriptChunker),
+    )
       
     def __init__(self, parsers: Dict[str, any]):
         """
@@ -18,16 +28,10 @@ class ChunkManager:
             parsers: Dict mapping file extensions to tree-sitter parsers
         """
         info("Initializing ChunkManager")
-        self.LANGUAGE_MAPPING = {
-        '.py': ('python', PythonChunker),
-        '.js': ('javascript', JavaScriptChunker),
-        '.java': ('java', JavaChunker),
-        '.ts': ('typescript', TypeScriptChunker),
-        '.tsx': ('typescript', TypeScriptChunker),
-        }
         self.logger = logging.getLogger(self.__class__.__name__)
         self.parsers = parsers  # Store the parsers
-        debug(f"Received {len(parsers)} language parsers")
+        self._lang_by_ext = {ext: lang for ext, lang, _ in self.LANGUAGE_MAPPING}
+        debug("Received %d language parsers", len(parsers))
         self.chunkers = self._initialize_chunkers(parsers)
         info(f"ChunkManager initialized with {len(self.chunkers)} language chunkers")
     
@@ -35,10 +39,9 @@ class ChunkManager:
         """Initialize language-specific chunkers"""
         info("Initializing language-specific chunkers")
         chunkers = {}
-        self.parsers = parsers
         try:
-            for ext, (lang, chunker_class) in self.LANGUAGE_MAPPING.items():
-                parser = self.parsers.get(ext)
+            for ext, lang, chunker_class in self.LANGUAGE_MAPPING:
+                parser = parsers.get(ext)
                 if parser:
                     chunkers[ext] = chunker_class(parser)
                     info(f"Initialized chunker for {lang} ({ext})")
@@ -46,4 +49,8 @@ class ChunkManager:
                     warning(f"No parser found for {lang} ({ext}), chunking will be unavailable")
         except Exception as e:
             error(f"Error initializing chunkers: {e}")
-        return chunkers
\ No newline at end of file
+        return chunkers
+    
+    def get_language(self, ext: str) -> Optional[str]:
+        """Return the language name handled for a file extension"""
+        return self._lang_by_ext.get(ext)
@@ -1,46 +1,65 @@
 import os
-from pathlib import Path
+import codecs
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import logging
 from config.logging_config import info, warning, debug, error
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from chunking.strategies import ChunkInfo
+from chunking.parallel import bounded_map, WINDOW_PER_WORKER
 
 logger = logging.getLogger(__name__)
 
 class DocumentChunker:
+    # Documentation files are recognised by suffix alone
+    DOC_SUFFIXES = ('.md', '.txt', '.rst')
+    ENCODINGS = ('utf-8', 'windows-1252', 'latin-1')
     
     def __init__(self):
-        # File patterns for documentation  files
-        self.doc_pattern = ['**/*.md', '**/*.txt', '**/*.rst']
-        self.excluded_dirs = ['.git', 'node_modules', 'venv', '__pycache__', 'build', 'dist']
+        self.excluded_dirs = frozenset({'.git', 'node_modules', 'venv', '__pycache__', 'build', 'dist'})
+        self._splitters = {}
         info("DocumentChunker initialized")
         
     def scan_files(self, repo_path):
         """
-        Scan repository for files matching given patterns.
+        Scan repository for documentation files with a single scandir walk.
         Args:
-            patterns: List of file patterns to match
+            repo_path: Root directory of the repository
         Returns:
-            Set of matched file paths
+            List of matched file paths
         """
         info(f"Scanning repository for documentation files: {repo_path}")
-        matched_files = set()
-        repo_path = Path(repo_path) 
+        matched_files = []
+        stack = [str(repo_path)]
         
         try:
-            for root, dirs, files in os.walk(repo_path):
-                dirs[:] = [d for d in dirs if d not in self.excluded_dirs]
-                
-                for file in files:
-                    file_path = Path(root) / file
-                    if any(file_path.match(pattern) for pattern in self.doc_pattern):
-                        matched_files.add(file_path)
+            while stack:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.excluded_dirs:
+                                stack.append(entry.path)
+                        elif entry.name.endswith(self.DOC_SUFFIXES) and entry.is_file():
+                            matched_files.append(entry.path)
             
             info(f"Found {len(matched_files)} documentation files")
             return matched_files
         except Exception as e:
             error(f"Error scanning repository files: {e}")
-            return set()
+            return []
+    
+    def _get_splitter(self, chunk_size, chunk_overlap):
+        """Return a cached text splitter for the given size and overlap"""
+        key = (chunk_size, chunk_overlap)
+        splitter = self._splitters.get(key)
+        if splitter is None:
+            splitter = self._splitters.setdefault(key, RecursiveCharacterTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                length_function=len,
+                separators=["\n\n", "\n", " ", ""]
+            ))
+        return splitter
     
     def create_chunks(self, text, metadata, file_path,
                     chunk_size = 1000, 
@@ -57,12 +76,7 @@ class DocumentChunker:
         """
         info(f"Creating chunks for file: {file_path}")
         try:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                length_function=len,
-                separators=["\n\n", "\n", " ", ""]
-            )
+            text_splitter = self._get_splitter(chunk_size, chunk_overlap)
             
             chunks = text_splitter.create_documents(
                 texts=[text],
@@ -101,54 +115,94 @@ class DocumentChunker:
             return None
         
            
-    def parse_directory(self, repo_path):
+    def _read_text(self, file_path):
         """
-        Process repository documentation files.
+        Read a file once and decode it, sniffing the UTF-8 BOM first.
+        Args:
+            file_path: Path of the file
+        Returns:
+            Decoded text, or None if the file cannot be read
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            error(f"Error reading {file_path}: {e}")
+            return None
+        
+        if raw.startswith(codecs.BOM_UTF8):
+            return raw[len(codecs.BOM_UTF8):].decode('utf-8', errors='replace')
+        # Common encodings in priority order; latin-1 decodes any byte sequence
+        for encoding in self.ENCODINGS:
+            try:
+                return raw.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+        return None
+    
+    def _process_one(self, file_path, repo_path):
+        """
+        Read and chunk a single documentation file.
         Args:
+            file_path: Path of the documentation file
             repo_path: Git Repository
         Returns:
-            List of processed documents
+            (file_path, processed document) tuple, or None if nothing was produced
+        """
+        text = self._read_text(file_path)
+        if text is None:
+            warning(f"Could not read file {file_path} with any of the supported encodings")
+            return None
+        
+        chunk_result = self.create_chunks(
+            text,
+            {
+                'doc_type': 'document_file',
+                'source': os.path.relpath(file_path, repo_path),
+                'filename': os.path.basename(file_path),
+                'file_type': os.path.splitext(file_path)[1]
+            }, file_path
+        )
+        if not chunk_result:
+            warning(f"No chunks created for {file_path}")
+            return None
+        return file_path, chunk_result
+           
+    def iter_directory(self, repo_path):
+        """
+        Process repository documentation files, reading and chunking them in parallel.
+        Args:
+            repo_path: Git Repository
+        Yields:
+            (file_path, processed document) tuples
         """
         info(f"Parsing documentation files in directory: {repo_path}")
         try:
             doc_matched_files = self.scan_files(repo_path)
-            repo_path = Path(repo_path) 
             info(f"Processing {len(doc_matched_files)} documentation files")
             
-            doc_chunks = {}
-            # Common encodings in priority order
-            encodings = ['utf-8-sig', 'utf-8', 'windows-1252', 'latin-1', 'ascii']
-            
-            for file_path in doc_matched_files:
-                text = None
-                for encoding in encodings:
-                    try:
-                        with open(file_path, 'r', encoding=encoding) as f:
-                            text = f.read()
-                            break
-                    except UnicodeDecodeError:
-                        continue
-                                   
-                if text is not None: 
-                    chunk_result = self.create_chunks(
-                        text,
-                        {
-                            'doc_type': 'document_file',
-                            'source': str(file_path.relative_to(repo_path)),
-                            'filename': file_path.name,
-                            'file_type': file_path.suffix
-                        }, str(file_path)
-                    )
-                    if chunk_result:
-                        doc_chunks[str(file_path)] = chunk_result
-                    else:
-                        warning(f"No chunks created for {file_path}")
-                else:
-                    warning(f"Could not read file {file_path} with any of the supported encodings")
+            processed = 0
+            max_workers = os.cpu_count() or 1
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for result in bounded_map(
+                    executor, partial(self._process_one, repo_path=repo_path),
+                    doc_matched_files, max_workers * WINDOW_PER_WORKER
+                ):
+                    if result:
+                        processed += 1
+                        yield result
                         
-            info(f"Completed parsing with {len(doc_chunks)} files processed")
-            return doc_chunks
+            info(f"Completed parsing with {processed} files processed")
             
         except Exception as e:
             error(f"Error parsing directory {repo_path}: {e}")
-            return {}
\ No newline at end of file
+    
+    def parse_directory(self, repo_path):
+        """
+        Process repository documentation files.
+        Args:
+            repo_path: Git Repository
+        Returns:
+            Dict of processed documents keyed by file path
+        """
+        return dict(self.iter_directory(repo_path))
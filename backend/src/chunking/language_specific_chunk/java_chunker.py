@@ -1,6 +1,9 @@
 from typing import List, Dict, Optional, Set
 from tree_sitter import Node
 import logging
+import sys
+from collections import Counter
+from itertools import accumulate
 from config.logging_config import info, warning, debug, error
 
 from git_repo_parser.base_types import CodeEntity
@@ -114,19 +117,36 @@ class JavaChunker:
     LARGE_ENTITY_THRESHOLD = 100  # Threshold for splitting entities
     
     # Java-specific patterns
-    COHESIVE_TYPES = {
+    COHESIVE_TYPES = frozenset({
         'class', 'interface', 'enum', 'annotation'
-    }
+    })
     
     RELATED_TYPES = {
-        'class': {'method', 'constructor', 'field', 'inner_class'},
-        'interface': {'method', 'field'},
-        'enum': {'field', 'method', 'constructor'},
-        'annotation': {'method', 'field'}
+        'class': frozenset({'method', 'constructor', 'field', 'inner_class'}),
+        'interface': frozenset({'method', 'field'}),
+        'enum': frozenset({'field', 'method', 'constructor'}),
+        'annotation': frozenset({'method', 'field'})
+    }
+    
+    # Chunk-worthy nodes whose subtrees are fully covered by their own chunk
+    LEAF_CHUNK_NODES = frozenset({
+        'method_declaration', 'constructor_declaration',
+        'static_initializer', 'field_declaration'
+    })
+    
+    # Group type priority, lower rank wins
+    TYPE_PRIORITY = {
+        'class': 0,
+        'interface': 1,
+        'enum': 2,
+        'annotation': 3,
+        'constructor': 4,
+        'method': 5,
+        'field': 6
     }
     
     # Logical split points for large entities
-    SPLIT_MARKERS = [
+    SPLIT_MARKERS = (
         '}',           # End of block
         '\n\n',       # Double newline
         'public ',    # Method modifiers
@@ -140,10 +160,11 @@ class JavaChunker:
         'try {',      # Error handling
         '@Override',  # Common annotations
         'return '     # Return statements
-    ]
+    )
     
     def __init__(self, parser):
         self.parser = parser
+        self._id_query = parser.language.query('(identifier) @id (type_identifier) @id')
         self.logger = logging.getLogger(self.__class__.__name__)
         self.import_strategy = JavaImportStrategy()
         self.file_path = None
@@ -181,7 +202,7 @@ class JavaChunker:
             error(f"Error creating Java chunks: {e}")
             return []
     
-    def create_chunks_from_entities(self, entities: List[CodeEntity], file_path: str) -> List[ChunkInfo]:
+    def create_chunks_from_entities(self, entities: List[CodeEntity], file_path: str, content: Optional[str] = None) -> List[ChunkInfo]:
         """Create optimized chunks from Java entities"""
         try:
             info(f"Creating chunks from {len(entities)} Java entities for file: {file_path}")
@@ -202,8 +223,9 @@ class JavaChunker:
             # Add imports (read file to get imports)
             info("Adding imports from file")
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                if content is None:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
                 
                 import_chunks = self.import_strategy.chunk(content, file_path)
                 chunks.extend(import_chunks)
@@ -227,15 +249,29 @@ class JavaChunker:
             return chunks
     
     def _process_node(self, node: Node, code: str, file_path: str, chunks: List[ChunkInfo]) -> None:
+        """Walk a Java AST in pre-order with a TreeCursor and chunk each chunk-worthy node"""
+        cursor = node.walk()
+        while True:
+            current = cursor.node
+            self._chunk_node(current, code, file_path, chunks)
+            # Descend into type bodies only; members are emitted whole, so their subtrees are skipped
+            if current.type not in self.LEAF_CHUNK_NODES and cursor.goto_first_child():
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return
+    
+    def _chunk_node(self, node: Node, code: str, file_path: str, chunks: List[ChunkInfo]) -> None:
         """Process a Java AST node with improved chunking logic"""
         try:
             if self._is_chunk_worthy(node):
-                chunk_content = code[node.start_byte:node.end_byte]
+                # Node offsets are in bytes, so take the text from the node rather than slicing the str
+                chunk_content = node.text.decode('utf-8')
                 chunk_type = self._determine_chunk_type(node)
                 metadata = self._extract_metadata(node)
                 
                 # Handle large entities
-                content_lines = len(chunk_content.splitlines())
+                content_lines = node.end_point[0] - node.start_point[0] + 1
                 if content_lines > self.LARGE_ENTITY_THRESHOLD:
                     info(f"Splitting large {chunk_type} entity with {content_lines} lines")
                     chunks.extend(self._split_large_entity(
@@ -253,10 +289,6 @@ class JavaChunker:
                         end_line=node.end_point[0] + 1,
                         metadata=metadata
                     ))
-            
-            # Process child nodes
-            for child in node.children:
-                self._process_node(child, code, file_path, chunks)
                 
         except Exception as e:
             warning(f"Error processing node at line {node.start_point[0]+1}: {e}")
@@ -293,40 +325,38 @@ class JavaChunker:
         """Split a large entity into multiple smaller chunks"""
         info(f"Splitting large {entity_type} entity starting at line {start_line}")
         chunks = []
-        lines = content.splitlines()
-        current_chunk_lines = []
-        current_start = start_line
+        lines = content.splitlines(keepends=True)
+        # Offset of each line, so every section is sliced from the source instead of re-joined
+        offsets = list(accumulate(map(len, lines), initial=0))
+        chunk_start = 0
         chunk_number = 1
         
         for i, line in enumerate(lines):
-            current_chunk_lines.append(line)
-            
             # Check for logical split points
-            should_split = False
-            if len(current_chunk_lines) >= self.MAX_CHUNK_LINES:
-                should_split = True
-            elif len(current_chunk_lines) > self.MIN_CHUNK_LINES:
-                if any(line.strip().startswith(marker) for marker in self.SPLIT_MARKERS):
-                    should_split = True
+            chunk_length = i - chunk_start + 1
+            should_split = (
+                chunk_length >= self.MAX_CHUNK_LINES or
+                (chunk_length > self.MIN_CHUNK_LINES and
+                 line.strip().startswith(self.SPLIT_MARKERS))
+            )
             
-            if should_split or i == len(lines) - 1:
-                chunk = ChunkInfo(
-                    content='\n'.join(current_chunk_lines),
+            if should_split or i == len(lines) - 1:  # Also handle last chunk
+                section_content = content[offsets[chunk_start]:offsets[i] + len(line.rstrip('\r\n'))]
+                chunks.append(ChunkInfo(
+                    content=section_content,
                     language='java',
-                    chunk_id=f"{file_path}:{entity_type}_{current_start}_{chunk_number}",
+                    chunk_id=f"{file_path}:{entity_type}_{start_line + chunk_start}_{chunk_number}",
                     type=entity_type,
-                    start_line=current_start,
-                    end_line=current_start + len(current_chunk_lines) - 1,
+                    start_line=start_line + chunk_start,
+                    end_line=start_line + i,
                     metadata={
                         **metadata,
                         'is_partial': True,
                         'section_number': chunk_number,
                         'total_sections': (len(lines) // self.MAX_CHUNK_LINES) + 1
                     }
-                )
-                chunks.append(chunk)
-                current_chunk_lines = []
-                current_start += len(current_chunk_lines)
+                ))
+                chunk_start = i + 1
                 chunk_number += 1
         
         info(f"Split large entity into {len(chunks)} chunks")
@@ -340,7 +370,7 @@ class JavaChunker:
         current_lines = 0
         
         for entity in group:
-            entity_lines = len(entity.content.splitlines())
+            entity_lines = entity.location.end_line - entity.location.start_line + 1
             
             if entity_lines > self.LARGE_ENTITY_THRESHOLD:
                 # Handle individual large entity
@@ -387,18 +417,26 @@ class JavaChunker:
             
         groups = []
         current_group = [entities[0]]
+        # Track the group's line span incrementally instead of re-measuring it per entity
+        group_start = entities[0].location.start_line
+        group_end = entities[0].location.end_line
         
         for entity in entities[1:]:
             prev_entity = current_group[-1]
             
             if self._should_merge_entities(prev_entity, entity):
-                if self._get_group_size(current_group + [entity]) <= self.MAX_CHUNK_LINES:
+                start_line = min(group_start, entity.location.start_line)
+                end_line = max(group_end, entity.location.end_line)
+                if end_line - start_line + 1 <= self.MAX_CHUNK_LINES:
                     current_group.append(entity)
+                    group_start, group_end = start_line, end_line
                     continue
             
             if current_group:
                 groups.append(current_group)
             current_group = [entity]
+            group_start = entity.location.start_line
+            group_end = entity.location.end_line
         
         if current_group:
             groups.append(current_group)
@@ -407,26 +445,21 @@ class JavaChunker:
     
     def _should_merge_entities(self, entity1: CodeEntity, entity2: CodeEntity) -> bool:
         """Determine if two entities should be merged"""
-        try:
-            # Check if entities are closely related
-            if entity1.type in self.COHESIVE_TYPES:
-                related_types = self.RELATED_TYPES.get(entity1.type, set())
-                if entity2.type in related_types:
-                    return True
-            
-            # Check for related methods
-            if entity1.type == 'method' and entity2.type == 'method':
-                lines1 = len(entity1.content.splitlines())
-                lines2 = len(entity2.content.splitlines())
-                if (lines1 < self.MAX_METHOD_LINES and lines2 < self.MAX_METHOD_LINES and
-                    entity2.location.start_line - entity1.location.end_line <= 3):
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            warning(f"Error checking entity merge: {e}")
-            return False
+        # Check if entities are closely related
+        if entity1.type in self.COHESIVE_TYPES:
+            related_types = self.RELATED_TYPES.get(entity1.type, frozenset())
+            if entity2.type in related_types:
+                return True
+        
+        # Check for related methods
+        if entity1.type == 'method' and entity2.type == 'method':
+            lines1 = entity1.location.end_line - entity1.location.start_line + 1
+            lines2 = entity2.location.end_line - entity2.location.start_line + 1
+            if (lines1 < self.MAX_METHOD_LINES and lines2 < self.MAX_METHOD_LINES and
+                entity2.location.start_line - entity1.location.end_line <= 3):
+                return True
+        
+        return False
     
     def _get_group_size(self, entities: List[CodeEntity]) -> int:
         """Get total lines in a group of entities"""
@@ -447,24 +480,32 @@ class JavaChunker:
             chunk_type = self._determine_primary_type(entities)
             content = self._combine_entity_contents(entities)
             
+            # Gather all per-entity facts in one pass over the group
+            entity_types = set()
+            declarations = []
+            annotations = set()
+            has_inner_class = is_public = is_static = is_abstract = False
+            for e in entities:
+                entity_metadata = e.metadata
+                entity_types.add(e.type)
+                declarations.append(e.name)
+                annotations.update(entity_metadata.get('annotations', []))
+                has_inner_class = has_inner_class or entity_metadata.get('is_inner_class', False)
+                is_public = is_public or entity_metadata.get('is_public', False)
+                is_static = is_static or entity_metadata.get('is_static', False)
+                is_abstract = is_abstract or entity_metadata.get('is_abstract', False)
+            
             metadata = {
                 'primary_type': chunk_type,
-                'entity_types': list(set(e.type for e in entities)),
+                'entity_types': list(entity_types),
                 'num_entities': len(entities),
-                'declarations': [e.name for e in entities],
-                'has_constructor': any(
-                    e.type == 'constructor' for e in entities
-                ),
-                'has_inner_class': any(
-                    e.metadata.get('is_inner_class', False) for e in entities
-                ),
-                'is_public': any(e.metadata.get('is_public', False) for e in entities),
-                'is_static': any(e.metadata.get('is_static', False) for e in entities),
-                'is_abstract': any(e.metadata.get('is_abstract', False) for e in entities),
-                'annotations': list(set(
-                    ann for e in entities 
-                    for ann in e.metadata.get('annotations', [])
-                ))
+                'declarations': declarations,
+                'has_constructor': 'constructor' in entity_types,
+                'has_inner_class': has_inner_class,
+                'is_public': is_public,
+                'is_static': is_static,
+                'is_abstract': is_abstract,
+                'annotations': list(annotations)
             }
             
             return ChunkInfo(
@@ -483,18 +524,12 @@ class JavaChunker:
 
     def _determine_primary_type(self, entities: List[CodeEntity]) -> str:
         """Determine the primary type for a group of entities"""
-        type_priority = ['class', 'interface', 'enum', 'annotation',
-                        'constructor', 'method', 'field']
+        type_counts = Counter(e.type for e in entities)
         
-        # First check priority types
-        for priority_type in type_priority:
-            if any(e.type == priority_type for e in entities):
-                return priority_type
-        
-        # Default to most common type
-        type_counts = {}
-        for entity in entities:
-            type_counts[entity.type] = type_counts.get(entity.type, 0) + 1
+        # Highest-priority type present wins, otherwise the most common type
+        ranked = [t for t in type_counts if t in self.TYPE_PRIORITY]
+        if ranked:
+            return min(ranked, key=self.TYPE_PRIORITY.__getitem__)
         
         return max(type_counts.items(), key=lambda x: x[1])[0]
 
@@ -622,22 +657,18 @@ class JavaChunker:
             
         return metadata
     
-    def _extract_dependencies(self, content: str, name_to_chunk: Dict[str, ChunkInfo]) -> Set[str]:
+    def _extract_dependencies(self, content: str, names_by_bytes: Dict[bytes, str]) -> Set[str]:
         """Extract dependencies from chunk content"""
         deps = set()
         try:
             # Parse the chunk
             tree = self.parser.parse(bytes(content, 'utf-8'))
             
-            def visit_node(node: Node):
-                if node.type in {'type_identifier', 'identifier'}:
-                    name = node.text.decode('utf-8')
-                    if name in name_to_chunk:
-                        deps.add(name)
-                for child in node.children:
-                    visit_node(child)
-            
-            visit_node(tree.root_node)
+            # Let tree-sitter's query engine find identifiers instead of walking the tree in Python
+            for node, _ in self._id_query.captures(tree.root_node):
+                name = names_by_bytes.get(node.text)
+                if name is not None:
+                    deps.add(name)
             return deps
             
         except Exception as e:
@@ -651,21 +682,24 @@ class JavaChunker:
             # Build name to chunk mapping
             name_to_chunk = {}
             for chunk in chunks:
-                if chunk.type in ['class', 'interface', 'enum', 'annotation']:
+                if chunk.type in {'class', 'interface', 'enum', 'annotation'}:
                     # Extract name from first line
                     first_line = chunk.content.splitlines()[0]
                     words = first_line.split()
                     for word in words:
-                        if word not in ['class', 'interface', 'enum', 'public', 
-                                      'private', 'protected', 'static', 'final']:
+                        if word not in {'class', 'interface', 'enum', 'public', 
+                                      'private', 'protected', 'static', 'final'}:
                             name = word.split('{')[0].strip()
                             name_to_chunk[name] = chunk
                             break
             
+            # Match identifiers as raw bytes and map hits back to one interned name string
+            names_by_bytes = {name.encode('utf-8'): sys.intern(name) for name in name_to_chunk}
+            
             # Find dependencies between chunks
             for chunk in chunks:
                 if chunk.type != 'import':
-                    deps = self._extract_dependencies(chunk.content, name_to_chunk)
+                    deps = self._extract_dependencies(chunk.content, names_by_bytes)
                     chunk.dependencies.update(deps)
                     
                     # Add relationship metadata
@@ -1,6 +1,8 @@
 from typing import List, Dict, Optional, Set
 from tree_sitter import Node
 import logging
+import sys
+from collections import Counter
 from config.logging_config import info, warning, debug, error
 
 from git_repo_parser.base_types import CodeEntity
@@ -16,6 +18,7 @@ class PythonImportStrategy(ImportChunkingStrategy):
     """Enhanced Python import strategy"""
     
     MAX_IMPORTS_PER_CHUNK = 10
+    IMPORT_PREFIXES = ('import ', 'from ')
     
     def __init__(self):
         super().__init__()
@@ -35,8 +38,7 @@ class PythonImportStrategy(ImportChunkingStrategy):
                 continue
                 
             # Check for imports
-            if (stripped.startswith('import ') or 
-                stripped.startswith('from ')):
+            if stripped.startswith(self.IMPORT_PREFIXES):
                 
                 if not current_imports:
                     start_line = i
@@ -94,19 +96,32 @@ class PythonChunker:
     LARGE_ENTITY_THRESHOLD = 100  # Threshold for splitting entities
     
     # Python-specific patterns
-    COHESIVE_TYPES = {
+    COHESIVE_TYPES = frozenset({
         'class', 'module', 'function', 'dataclass'
-    }
+    })
     
     RELATED_TYPES = {
-        'class': {'method', 'property', 'class_variable'},
-        'dataclass': {'method', 'field'},
-        'function': {'function', 'async_function'},
-        'module': {'function', 'class', 'constant'}
+        'class': frozenset({'method', 'property', 'class_variable'}),
+        'dataclass': frozenset({'method', 'field'}),
+        'function': frozenset({'function', 'async_function'}),
+        'module': frozenset({'function', 'class', 'constant'})
+    }
+    
+    # Function-like types that may be merged when both are small
+    FUNCTION_TYPES = frozenset({'function', 'async_function'})
+    
+    # Group type priority, lower rank wins
+    TYPE_PRIORITY = {
+        'class': 0,
+        'function': 1,
+        'async_function': 2,
+        'method': 3,
+        'property': 4,
+        'dataclass': 5
     }
     
     # Logical split points for large entities
-    SPLIT_MARKERS = [
+    SPLIT_MARKERS = (
         'def ',        # Function definition
         'class ',      # Class definition
         'async def ',  # Async function
@@ -120,10 +135,12 @@ class PythonChunker:
         'return ',    # Return statements
         '# SECTION',  # Manual section markers
         '\n\n'        # Double newline
-    ]
+    )
     
     def __init__(self, parser):
         self.parser = parser
+        self._language = parser.language
+        self._id_query = self._language.query('(identifier) @id')
         self.logger = logging.getLogger(self.__class__.__name__)
         
         # Initialize strategies
@@ -133,7 +150,7 @@ class PythonChunker:
         self.file_path = None
         info("PythonChunker initialized with strategies")
     
-    def create_chunks_from_entities(self, entities: List[CodeEntity], file_path: str) -> List[ChunkInfo]:
+    def create_chunks_from_entities(self, entities: List[CodeEntity], file_path: str, content: Optional[str] = None) -> List[ChunkInfo]:
         """Create optimized chunks from Python entities"""
         try:
             info(f"Creating chunks from {len(entities)} Python entities for file: {file_path}")
@@ -142,8 +159,9 @@ class PythonChunker:
             # Read file content
             info(f"Reading Python file: {file_path}")
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                if content is None:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
             except Exception as e:
                 error(f"Error reading Python file {file_path}: {e}")
                 raise
@@ -155,25 +173,43 @@ class PythonChunker:
             import_chunks = self.import_strategy.chunk(content, file_path)
             chunks.extend(import_chunks)
             
+            # API endpoints are chunked by the API strategy alone, everything else is grouped
+            api_entities = [e for e in entities if self._is_api_entity(e)]
+            if api_entities:
+                info(f"Processing {len(api_entities)} API entities")
+                for entity in api_entities:
+                    chunks.extend(self.api_strategy.chunk(entity.content, file_path))
+            
             # Group and process entities
             info("Grouping and sorting Python entities")
-            sorted_entities = sorted(entities, key=lambda e: e.location.start_line)
-            entity_groups = self._group_entities(sorted_entities)
+            other_entities = [e for e in entities if not self._is_api_entity(e)]
+            try:
+                sorted_entities = sorted(other_entities, key=lambda e: e.location.start_line)
+                entity_groups = self._group_entities(sorted_entities)
+            except Exception as e:
+                # Grouping is only an optimization; fall back to one group per entity
+                warning(f"Could not group Python entities in {file_path}, chunking them one by one: {e}")
+                entity_groups = [[entity] for entity in other_entities]
             info(f"Created {len(entity_groups)} entity groups")
             
-            # Process each group
+            # Process each group, collecting failures instead of guarding every helper call
             info("Processing entity groups")
+            failed_entities = []
             for group in entity_groups:
-                new_chunks = self._process_entity_group(group)
-                chunks.extend(new_chunks)
-            
-            # Process API endpoints if any
-            api_entities = [e for e in entities if self._is_api_entity(e)]
-            if api_entities:
-                info(f"Processing {len(api_entities)} API entities")
-                for entity in api_entities:
-                    api_chunks = self.api_strategy.chunk(entity.content, file_path)
-                    chunks.extend(api_chunks)
+                try:
+                    chunks.extend(self._process_entity_group(group))
+                except Exception as e:
+                    if len(group) == 1:
+                        failed_entities.append((group[0].name, e))
+                        continue
+                    # Retry a failed group entity by entity so only the bad entity is lost
+                    for entity in group:
+                        try:
+                            chunks.extend(self._process_entity_group([entity]))
+                        except Exception as e:
+                            failed_entities.append((entity.name, e))
+            if failed_entities:
+                warning(f"Could not chunk {len(failed_entities)} entities in {file_path}: {failed_entities}")
             
             # Add dependencies
             info("Adding dependencies between chunks")
@@ -193,8 +229,7 @@ class PythonChunker:
 
     def _is_api_entity(self, entity: CodeEntity) -> bool:
         """Check if entity is an API endpoint"""
-        decorators = entity.metadata.get('decorators', [])
-        return any(d.startswith(('@app.', '@router.')) for d in decorators)
+        return entity.metadata.get('is_api', False)
 
     def _process_entity_group(self, group: List[CodeEntity]) -> List[ChunkInfo]:
         """Process a group of entities, handling large entities appropriately"""
@@ -210,14 +245,10 @@ class PythonChunker:
             info(f"Splitting large group of {len(group)} entities with {total_lines} lines")
             chunks.extend(self._split_large_group(group))
         else:
-            # Normal sized group - process with appropriate strategy
-            if self._is_api_entity(group[0]):
-                info(f"Processing API entity: {group[0].name}")
-                chunks.extend(self.api_strategy.chunk(group[0].content, self.file_path))
-            else:
-                chunk = self._create_chunk_from_group(group)
-                if chunk:
-                    chunks.append(chunk)
+            # Normal sized group - API entities never reach here, they are chunked up front
+            chunk = self._create_chunk_from_group(group)
+            if chunk:
+                chunks.append(chunk)
         
         return chunks
 
@@ -226,69 +257,78 @@ class PythonChunker:
         info(f"Splitting large {entity.type} entity: {entity.name}")
         chunks = []
         lines = entity.content.splitlines()
-        current_chunk_lines = []
-        current_start_line = entity.location.start_line
+        chunk_start = 0
         chunk_number = 1
         current_indent = None
         
         for i, line in enumerate(lines):
             # Track Python indentation
-            if not line.strip():
-                current_chunk_lines.append(line)
+            stripped = line.lstrip()
+            if not stripped:
                 continue
                 
-            indent = len(line) - len(line.lstrip())
+            indent = len(line) - len(stripped)
             if current_indent is None:
                 current_indent = indent
             
-            current_chunk_lines.append(line)
-            
             # Check for logical split points
-            should_split = False
-            if len(current_chunk_lines) >= self.MAX_CHUNK_LINES:
-                should_split = True
-            elif len(current_chunk_lines) > self.MIN_CHUNK_LINES:
-                # Only split at matching indentation level
-                if indent <= current_indent:
-                    for marker in self.SPLIT_MARKERS:
-                        if line.lstrip().startswith(marker):
-                            should_split = True
-                            break
+            chunk_length = i - chunk_start + 1
+            should_split = (
+                chunk_length >= self.MAX_CHUNK_LINES or
+                (chunk_length > self.MIN_CHUNK_LINES and
+                 indent <= current_indent and
+                 stripped.startswith(self.SPLIT_MARKERS))
+            )
             
-            if should_split or i == len(lines) - 1:
-                chunk = ChunkInfo(
-                    content='\n'.join(current_chunk_lines),
-                    language='python',
-                    chunk_id=f"{self.file_path}:{entity.type}_{entity.name}_{chunk_number}",
-                    type=entity.type,
-                    start_line=current_start_line,
-                    end_line=current_start_line + len(current_chunk_lines) - 1,
-                    metadata={
-                        'is_partial': True,
-                        'parent_entity': entity.name,
-                        'section_number': chunk_number,
-                        'total_sections': (len(lines) // self.MAX_CHUNK_LINES) + 1,
-                        'original_start': entity.location.start_line,
-                        'original_end': entity.location.end_line,
-                        'original_type': entity.type,
-                        'is_async': entity.metadata.get('is_async', False),
-                        'decorators': entity.metadata.get('decorators', []),
-                        'docstring': self._extract_docstring(current_chunk_lines)
-                    }
-                )
-                chunks.append(chunk)
-                current_chunk_lines = []
-                current_start_line += len(current_chunk_lines)
+            if should_split:
+                chunks.append(self._create_section_chunk(
+                    entity, lines, chunk_start, i + 1, chunk_number
+                ))
+                chunk_start = i + 1
                 chunk_number += 1
                 current_indent = None
         
+        if chunk_start < len(lines):
+            chunks.append(self._create_section_chunk(
+                entity, lines, chunk_start, len(lines), chunk_number
+            ))
+        
         info(f"Split large entity into {len(chunks)} chunks")
         return chunks
 
+    def _create_section_chunk(self, entity: CodeEntity, lines: List[str], start: int,
+                              end: int, chunk_number: int) -> ChunkInfo:
+        """Create a chunk from the lines[start:end] section of a large entity"""
+        section_lines = lines[start:end]
+        start_line = entity.location.start_line + start
+        return ChunkInfo(
+            content='\n'.join(section_lines),
+            language='python',
+            chunk_id=f"{self.file_path}:{entity.type}_{entity.name}_{chunk_number}",
+            type=entity.type,
+            start_line=start_line,
+            end_line=start_line + len(section_lines) - 1,
+            metadata={
+                'is_partial': True,
+                'parent_entity': entity.name,
+                'section_number': chunk_number,
+                'total_sections': (len(lines) // self.MAX_CHUNK_LINES) + 1,
+                'original_start': entity.location.start_line,
+                'original_end': entity.location.end_line,
+                'original_type': entity.type,
+                'is_async': entity.metadata.get('is_async', False),
+                'decorators': entity.metadata.get('decorators', []),
+                'docstring': self._extract_docstring(section_lines)
+            }
+        )
+
     def _extract_docstring(self, lines: List[str]) -> Optional[str]:
         """Extract docstring from chunk lines"""
         try:
             content = '\n'.join(lines)
+            # A docstring needs a string literal; skip the parse when there can't be one
+            if '"' not in content and "'" not in content:
+                return None
             tree = self.parser.parse(bytes(content, 'utf-8'))
             for node in tree.root_node.children:
                 if node.type == 'expression_statement':
@@ -308,7 +348,7 @@ class PythonChunker:
         current_lines = 0
         
         for entity in group:
-            entity_lines = len(entity.content.splitlines())
+            entity_lines = entity.location.end_line - entity.location.start_line + 1
             
             if entity_lines > self.LARGE_ENTITY_THRESHOLD:
                 # Handle individual large entity
@@ -350,6 +390,9 @@ class PythonChunker:
         groups = []
         current_group = [entities[0]]
         current_indent = None
+        # Track the group's line span incrementally instead of re-measuring it per entity
+        group_start = entities[0].location.start_line
+        group_end = entities[0].location.end_line
         
         for entity in entities[1:]:
             prev_entity = current_group[-1]
@@ -362,19 +405,24 @@ class PythonChunker:
                 current_indent = indent
             
             # Check merging conditions
+            start_line = min(group_start, entity.location.start_line)
+            end_line = max(group_end, entity.location.end_line)
             should_merge = (
                 self._should_merge_entities(prev_entity, entity) and
                 indent >= current_indent and
-                self._get_group_size(current_group + [entity]) <= self.MAX_CHUNK_LINES
+                end_line - start_line + 1 <= self.MAX_CHUNK_LINES
             )
             
             if should_merge:
                 current_group.append(entity)
+                group_start, group_end = start_line, end_line
             else:
                 if current_group:
                     groups.append(current_group)
                 current_group = [entity]
                 current_indent = indent
+                group_start = entity.location.start_line
+                group_end = entity.location.end_line
         
         if current_group:
             groups.append(current_group)
@@ -383,25 +431,20 @@ class PythonChunker:
 
     def _should_merge_entities(self, entity1: CodeEntity, entity2: CodeEntity) -> bool:
         """Determine if two entities should be merged"""
-        try:
-            # Check if entities are closely related
-            if entity1.type in self.COHESIVE_TYPES:
-                related_types = self.RELATED_TYPES.get(entity1.type, set())
-                if entity2.type in related_types:
-                    return True
-            
-            # Check for related functions
-            if entity1.type in ['function', 'async_function'] and entity2.type in ['function', 'async_function']:
-                lines1 = len(entity1.content.splitlines())
-                lines2 = len(entity2.content.splitlines())
-                if lines1 < self.MAX_METHOD_LINES and lines2 < self.MAX_METHOD_LINES:
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            warning(f"Error checking entity merge: {e}")
-            return False
+        # Check if entities are closely related
+        if entity1.type in self.COHESIVE_TYPES:
+            related_types = self.RELATED_TYPES.get(entity1.type, frozenset())
+            if entity2.type in related_types:
+                return True
+        
+        # Check for related functions
+        if entity1.type in self.FUNCTION_TYPES and entity2.type in self.FUNCTION_TYPES:
+            lines1 = entity1.location.end_line - entity1.location.start_line + 1
+            lines2 = entity2.location.end_line - entity2.location.start_line + 1
+            if lines1 < self.MAX_METHOD_LINES and lines2 < self.MAX_METHOD_LINES:
+                return True
+        
+        return False
 
     def _get_group_size(self, entities: List[CodeEntity]) -> int:
         """Get total lines in a group of entities"""
@@ -417,51 +460,53 @@ class PythonChunker:
         if not entities:
             return None
             
-        try:
-            entities = sorted(entities, key=lambda e: e.location.start_line)
-            chunk_type = self._determine_group_type(entities)
-            content = self._combine_entity_contents(entities)
-            
-            metadata = {
-                'primary_type': chunk_type,
-                'entity_types': list(set(e.type for e in entities)),
-                'num_entities': len(entities),
-                'declarations': [e.name for e in entities],
-                'is_async': any(e.metadata.get('is_async', False) for e in entities),
-                'decorators': [d for e in entities 
-                             for d in e.metadata.get('decorators', [])],
-                'has_docstring': any(e.metadata.get('docstring') for e in entities),
-                'is_api': any(self._is_api_entity(e) for e in entities),
-            }
-            
-            return ChunkInfo(
-                content=content,
-                language='python',
-                chunk_id=f"{self.file_path}:{chunk_type}_{entities[0].location.start_line}",
-                type=chunk_type,
-                start_line=entities[0].location.start_line,
-                end_line=entities[-1].location.end_line,
-                metadata=metadata
-            )
-            
-        except Exception as e:
-            warning(f"Error creating chunk from group: {e}")
-            return None
+        entities = sorted(entities, key=lambda e: e.location.start_line)
+        chunk_type = self._determine_group_type(entities)
+        content = self._combine_entity_contents(entities)
+        
+        # Gather all per-entity facts in one pass over the group
+        entity_types = set()
+        declarations = []
+        decorators = []
+        is_async = has_docstring = is_api = False
+        for e in entities:
+            entity_metadata = e.metadata
+            entity_types.add(e.type)
+            declarations.append(e.name)
+            decorators.extend(entity_metadata.get('decorators', []))
+            is_async = is_async or entity_metadata.get('is_async', False)
+            has_docstring = has_docstring or bool(entity_metadata.get('docstring'))
+            is_api = is_api or self._is_api_entity(e)
+        
+        metadata = {
+            'primary_type': chunk_type,
+            'entity_types': list(entity_types),
+            'num_entities': len(entities),
+            'declarations': declarations,
+            'is_async': is_async,
+            'decorators': decorators,
+            'has_docstring': has_docstring,
+            'is_api': is_api,
+        }
+        
+        return ChunkInfo(
+            content=content,
+            language='python',
+            chunk_id=f"{self.file_path}:{chunk_type}_{entities[0].location.start_line}",
+            type=chunk_type,
+            start_line=entities[0].location.start_line,
+            end_line=entities[-1].location.end_line,
+            metadata=metadata
+        )
 
     def _determine_group_type(self, entities: List[CodeEntity]) -> str:
         """Determine the primary type for a group"""
-        type_priority = ['class', 'function', 'async_function', 'method', 
-                        'property', 'dataclass']
+        type_counts = Counter(e.type for e in entities)
         
-        # First check priority types
-        for priority_type in type_priority:
-            if any(e.type == priority_type for e in entities):
-                return priority_type
-        
-        # Default to most common type
-        type_counts = {}
-        for entity in entities:
-            type_counts[entity.type] = type_counts.get(entity.type, 0) + 1
+        # Highest-priority type present wins, otherwise the most common type
+        ranked = [t for t in type_counts if t in self.TYPE_PRIORITY]
+        if ranked:
+            return min(ranked, key=self.TYPE_PRIORITY.__getitem__)
         
         return max(type_counts.items(), key=lambda x: x[1])[0]
 
@@ -484,21 +529,16 @@ class PythonChunker:
         
         return '\n'.join(filter(None, contents))
 
-    def _extract_dependencies(self, content: str, name_to_chunk: Dict[str, ChunkInfo]) -> Set[str]:
+    def _extract_dependencies(self, content: str, names_by_bytes: Dict[bytes, str]) -> Set[str]:
         """Extract dependencies from chunk content"""
         deps = set()
         try:
             tree = self.parser.parse(bytes(content, 'utf-8'))
             
-            def visit_node(node: Node):
-                if node.type == 'identifier':
-                    name = node.text.decode('utf-8')
-                    if name in name_to_chunk:
-                        deps.add(name)
-                for child in node.children:
-                    visit_node(child)
-            
-            visit_node(tree.root_node)
+            for node, _ in self._id_query.captures(tree.root_node):
+                name = names_by_bytes.get(node.text)
+                if name is not None:
+                    deps.add(name)
             return deps
             
         except Exception as e:
@@ -516,10 +556,13 @@ class PythonChunker:
                     for name in chunk.metadata.get('declarations', []):
                         name_to_chunk[name] = chunk
             
+            # Match identifiers as raw bytes and map hits back to one interned name string
+            names_by_bytes = {name.encode('utf-8'): sys.intern(name) for name in name_to_chunk}
+            
             # Find dependencies
             for chunk in chunks:
                 if chunk.type != 'import':
-                    deps = self._extract_dependencies(chunk.content, name_to_chunk)
+                    deps = self._extract_dependencies(chunk.content, names_by_bytes)
                     chunk.dependencies.update(deps)
             
             info("Chunks enriched successfully")
@@ -1,6 +1,9 @@
 from typing import List, Dict, Any, Optional, Set
 from tree_sitter import Node
 import logging
+import sys
+from collections import Counter
+from itertools import accumulate
 from config.logging_config import info, warning, debug, error
 from ..strategies import BaseChunkingStrategy, ChunkInfo
 from git_repo_parser.base_types import CodeEntity
@@ -9,6 +12,8 @@ class TSImportStrategy(BaseChunkingStrategy):
     """Handles TypeScript imports and exports"""
     
     MAX_IMPORTS_PER_CHUNK = 10
+    COMMENT_PREFIXES = ('//', '/*', '*')
+    IMPORT_PREFIXES = ('import ', 'import type ', 'export type ', 'export ', 'require(')
     
     def __init__(self):
         super().__init__()
@@ -24,15 +29,11 @@ class TSImportStrategy(BaseChunkingStrategy):
             stripped = line.strip()
             
             # Skip empty lines and comments
-            if not stripped or stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
+            if not stripped or stripped.startswith(self.COMMENT_PREFIXES):
                 continue
                 
             # Check for imports and exports
-            if (stripped.startswith('import ') or 
-                stripped.startswith('import type ') or
-                stripped.startswith('export type ') or
-                stripped.startswith('export ') or
-                stripped.startswith('require(')):
+            if stripped.startswith(self.IMPORT_PREFIXES):
                 
                 if not current_imports:
                     start_line = i
@@ -87,19 +88,30 @@ class TypeScriptChunker:
     LARGE_ENTITY_THRESHOLD = 100  # Threshold for splitting entities
     
     # TypeScript-specific patterns
-    COHESIVE_TYPES = {
+    COHESIVE_TYPES = frozenset({
         'class', 'interface', 'enum', 'namespace', 'module'
-    }
+    })
     
     RELATED_TYPES = {
-        'class': {'method', 'property', 'constructor'},
-        'interface': {'type', 'method_signature', 'property_signature'},
-        'enum': {'enum_member'},
-        'namespace': {'function', 'const', 'let', 'var', 'type'}
+        'class': frozenset({'method', 'property', 'constructor'}),
+        'interface': frozenset({'type', 'method_signature', 'property_signature'}),
+        'enum': frozenset({'enum_member'}),
+        'namespace': frozenset({'function', 'const', 'let', 'var', 'type'})
+    }
+    
+    # Group type priority, lower rank wins
+    TYPE_PRIORITY = {
+        'class': 0,
+        'interface': 1,
+        'namespace': 2,
+        'enum': 3,
+        'function': 4,
+        'type': 5,
+        'variable': 6
     }
     
     # Logical split points for large entities
-    SPLIT_MARKERS = [
+    SPLIT_MARKERS = (
         '}',           # End of block
         '\n\n',       # Double newline
         'function',   # Function declaration
@@ -109,16 +121,17 @@ class TypeScriptChunker:
         'for ',
         'while ',
         'switch '
-    ]
+    )
     
     def __init__(self, parser):
         self.parser = parser
+        self._id_query = parser.language.query('(identifier) @id (type_identifier) @id')
         self.logger = logging.getLogger(self.__class__.__name__)
         self.import_strategy = TSImportStrategy()
         self.file_path = None
         info("TypeScriptChunker initialized")
 
-    def create_chunks_from_entities(self, entities: List[CodeEntity], file_path: str) -> List[ChunkInfo]:
+    def create_chunks_from_entities(self, entities: List[CodeEntity], file_path: str, content: Optional[str] = None) -> List[ChunkInfo]:
         """Create optimized chunks from TypeScript entities"""
         try:
             info(f"Creating chunks from {len(entities)} TypeScript entities for file: {file_path}")
@@ -127,8 +140,9 @@ class TypeScriptChunker:
             # Read file content
             info(f"Reading TypeScript file: {file_path}")
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                if content is None:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
             except Exception as e:
                 error(f"Error reading TypeScript file {file_path}: {e}")
                 raise
@@ -199,33 +213,30 @@ class TypeScriptChunker:
         """Split a large entity into multiple smaller chunks"""
         info(f"Splitting large {entity.type} entity: {entity.name}")
         chunks = []
-        lines = entity.content.splitlines()
-        current_chunk_lines = []
-        current_start_line = entity.location.start_line
+        lines = entity.content.splitlines(keepends=True)
+        # Offset of each line, so every section is sliced from the source instead of re-joined
+        offsets = list(accumulate(map(len, lines), initial=0))
+        chunk_start = 0
         chunk_number = 1
         
         for i, line in enumerate(lines):
-            current_chunk_lines.append(line)
-            
             # Check for logical split points
-            should_split = False
-            if len(current_chunk_lines) >= self.MAX_CHUNK_LINES:
-                should_split = True
-            elif len(current_chunk_lines) > self.MIN_CHUNK_LINES:
-                # Look for natural split points
-                for marker in self.SPLIT_MARKERS:
-                    if line.strip().startswith(marker):
-                        should_split = True
-                        break
+            chunk_length = i - chunk_start + 1
+            should_split = (
+                chunk_length >= self.MAX_CHUNK_LINES or
+                (chunk_length > self.MIN_CHUNK_LINES and
+                 line.strip().startswith(self.SPLIT_MARKERS))
+            )
             
             if should_split or i == len(lines) - 1:  # Also handle last chunk
-                chunk = ChunkInfo(
-                    content='\n'.join(current_chunk_lines),
+                section_content = entity.content[offsets[chunk_start]:offsets[i] + len(line.rstrip('\r\n'))]
+                chunks.append(ChunkInfo(
+                    content=section_content,
                     language='typescript',
                     chunk_id=f"{self.file_path}:{entity.type}_{entity.name}_{chunk_number}",
                     type=entity.type,
-                    start_line=current_start_line,
-                    end_line=current_start_line + len(current_chunk_lines) - 1,
+                    start_line=entity.location.start_line + chunk_start,
+                    end_line=entity.location.start_line + i,
                     metadata={
                         'is_partial': True,
                         'parent_entity': entity.name,
@@ -235,10 +246,8 @@ class TypeScriptChunker:
                         'original_end': entity.location.end_line,
                         'original_type': entity.type
                     }
-                )
-                chunks.append(chunk)
-                current_chunk_lines = []
-                current_start_line += len(current_chunk_lines)
+                ))
+                chunk_start = i + 1
                 chunk_number += 1
         
         info(f"Split large entity into {len(chunks)} chunks")
@@ -252,7 +261,7 @@ class TypeScriptChunker:
         current_lines = 0
         
         for entity in group:
-            entity_lines = len(entity.content.splitlines())
+            entity_lines = entity.location.end_line - entity.location.start_line + 1
             
             if entity_lines > self.LARGE_ENTITY_THRESHOLD:
                 # Handle individual large entity
@@ -293,20 +302,28 @@ class TypeScriptChunker:
             
         groups = []
         current_group = [entities[0]]
+        # Track the group's line span incrementally instead of re-measuring it per entity
+        group_start = entities[0].location.start_line
+        group_end = entities[0].location.end_line
         
         for entity in entities[1:]:
             prev_entity = current_group[-1]
             
             # Check if entities should be grouped
             if self._should_merge_entities(prev_entity, entity):
-                if self._get_group_size(current_group + [entity]) <= self.MAX_CHUNK_LINES:
+                start_line = min(group_start, entity.location.start_line)
+                end_line = max(group_end, entity.location.end_line)
+                if end_line - start_line + 1 <= self.MAX_CHUNK_LINES:
                     current_group.append(entity)
+                    group_start, group_end = start_line, end_line
                     continue
             
             # Start new group if can't merge
             if current_group:
                 groups.append(current_group)
             current_group = [entity]
+            group_start = entity.location.start_line
+            group_end = entity.location.end_line
         
         if current_group:
             groups.append(current_group)
@@ -315,27 +332,22 @@ class TypeScriptChunker:
 
     def _should_merge_entities(self, entity1: CodeEntity, entity2: CodeEntity) -> bool:
         """Determine if two entities should be merged"""
-        try:
-            # Check if entities are closely related
-            if entity1.type in self.COHESIVE_TYPES:
-                related_types = self.RELATED_TYPES.get(entity1.type, set())
-                if entity2.type in related_types:
-                    return True
-            
-            # Check for small helper functions
-            if entity1.type == 'function' and entity2.type == 'function':
-                lines1 = len(entity1.content.splitlines())
-                lines2 = len(entity2.content.splitlines())
-                if (lines1 < self.MAX_METHOD_LINES and 
-                    lines2 < self.MAX_METHOD_LINES and
-                    entity2.location.start_line - entity1.location.end_line <= self.MAX_GROUP_DISTANCE):
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            warning(f"Error checking entity merge: {e}")
-            return False
+        # Check if entities are closely related
+        if entity1.type in self.COHESIVE_TYPES:
+            related_types = self.RELATED_TYPES.get(entity1.type, frozenset())
+            if entity2.type in related_types:
+                return True
+        
+        # Check for small helper functions
+        if entity1.type == 'function' and entity2.type == 'function':
+            lines1 = entity1.location.end_line - entity1.location.start_line + 1
+            lines2 = entity2.location.end_line - entity2.location.start_line + 1
+            if (lines1 < self.MAX_METHOD_LINES and 
+                lines2 < self.MAX_METHOD_LINES and
+                entity2.location.start_line - entity1.location.end_line <= self.MAX_GROUP_DISTANCE):
+                return True
+        
+        return False
 
     def _get_group_size(self, entities: List[CodeEntity]) -> int:
         """Get total lines in a group of entities"""
@@ -382,18 +394,12 @@ class TypeScriptChunker:
 
     def _determine_group_type(self, entities: List[CodeEntity]) -> str:
         """Determine the primary type for a group"""
-        type_priority = ['class', 'interface', 'namespace', 'enum', 
-                        'function', 'type', 'variable']
-        
-        # First check priority types
-        for priority_type in type_priority:
-            if any(e.type == priority_type for e in entities):
-                return priority_type
+        type_counts = Counter(e.type for e in entities)
         
-        # Default to most common type
-        type_counts = {}
-        for entity in entities:
-            type_counts[entity.type] = type_counts.get(entity.type, 0) + 1
+        # Highest-priority type present wins, otherwise the most common type
+        ranked = [t for t in type_counts if t in self.TYPE_PRIORITY]
+        if ranked:
+            return min(ranked, key=self.TYPE_PRIORITY.__getitem__)
         
         return max(type_counts.items(), key=lambda x: x[1])[0]
 
@@ -479,22 +485,17 @@ class TypeScriptChunker:
             metadata=metadata
         )
 
-    def _extract_dependencies(self, content: str, 
-                            name_to_chunk: Dict[str, ChunkInfo]) -> Set[str]:
+    def _extract_dependencies(self, content: str, names_by_bytes: Dict[bytes, str]) -> Set[str]:
         """Extract dependencies from chunk content"""
         deps = set()
         try:
             tree = self.parser.parse(bytes(content, 'utf-8'))
             
-            def visit_node(node: Node):
-                if node.type in ['identifier', 'type_identifier']:
-                    name = node.text.decode('utf-8')
-                    if name in name_to_chunk:
-                        deps.add(name)
-                for child in node.children:
-                    visit_node(child)
-            
-            visit_node(tree.root_node)
+            # Let tree-sitter's query engine find identifiers instead of walking the tree in Python
+            for node, _ in self._id_query.captures(tree.root_node):
+                name = names_by_bytes.get(node.text)
+                if name is not None:
+                    deps.add(name)
             return deps
             
         except Exception as e:
@@ -513,10 +514,13 @@ class TypeScriptChunker:
                     for name in chunk.metadata.get('declarations', []):
                         name_to_chunk[name] = chunk
             
+            # Match identifiers as raw bytes and map hits back to one interned name string
+            names_by_bytes = {name.encode('utf-8'): sys.intern(name) for name in name_to_chunk}
+            
             # Find dependencies
             for chunk in chunks:
                 if chunk.type != 'import':
-                    deps = self._extract_dependencies(chunk.content, name_to_chunk)
+                    deps = self._extract_dependencies(chunk.content, names_by_bytes)
                     chunk.dependencies.update(deps)
             
             info("Chunks enriched successfully")
@@ -0,0 +1,24 @@
+from collections import deque
+from concurrent.futures import Executor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Items queued per worker while results are streamed to the caller
+WINDOW_PER_WORKER = 4
+
+
+def bounded_map(executor: Executor, fn: Callable[[T], R], items: Iterable[T], window: int) -> Iterator[R]:
+    """Like executor.map, in order, but with at most `window` items in flight so results never pile up"""
+    pending = deque()
+    items = iter(items)
+    for item in islice(items, window):
+        pending.append(executor.submit(fn, item))
+    while pending:
+        result = pending.popleft().result()
+        # Refill before handing the result over, so workers stay busy while the caller consumes it
+        for item in islice(items, 1):
+            pending.append(executor.submit(fn, item))
+        yield result
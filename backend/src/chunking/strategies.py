@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Set
 import logging
+import re
+import hashlib
 from config.logging_config import info, warning, debug, error
 
 @dataclass
@@ -17,11 +19,18 @@ class ChunkInfo:
     dependencies: Set[str] = field(default_factory=set)
     imports: Set[str] = field(default_factory=set)
 
+def chunk_id_for(content: str, file_path: str) -> str:
+    """Id the chunking strategies give a chunk of content in file_path"""
+    hasher = hashlib.blake2b(digest_size=4)
+    hasher.update(f"{file_path}:{content}".encode('utf-8'))
+    return f"chunk_{hasher.hexdigest()}"
+
 class BaseChunkingStrategy(ABC):
     """Base class for all chunking strategies"""
     
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._id_prefix = None
         info(f"Initializing {self.__class__.__name__}")
         
     @abstractmethod
@@ -30,14 +39,29 @@ class BaseChunkingStrategy(ABC):
         pass
     
     def _generate_chunk_id(self, content: str, file_path: str) -> str:
-        """Generate unique chunk ID"""
-        import hashlib
-        content = f"{file_path}:{content}".encode('utf-8')
-        return f"chunk_{hashlib.md5(content).hexdigest()[:8]}"
+        """Generate unique chunk ID, the same as chunk_id_for(content, file_path)"""
+        # All chunks of a file share the "<file_path>:" prefix, so hash it once and copy the state
+        prefix = self._id_prefix
+        if prefix is None or prefix[0] != file_path:
+            prefix_hasher = hashlib.blake2b(digest_size=4)
+            prefix_hasher.update(file_path.encode('utf-8'))
+            prefix_hasher.update(b':')
+            prefix = self._id_prefix = (file_path, prefix_hasher)
+        
+        hasher = prefix[1].copy()
+        hasher.update(content.encode('utf-8'))
+        return f"chunk_{hasher.hexdigest()}"
 
 class ApiChunkingStrategy(BaseChunkingStrategy):
     """Strategy for API code chunks"""
     
+    # Markers of a route definition, matched in a single regex scan per line
+    API_PATTERN = re.compile(r'@app\.|@router\.|app\.get|app\.post')
+    # HTTP method and path of a route decorator
+    ROUTE_PATTERN = re.compile(
+        r'@(?:app|router)\.(get|post|put|delete|patch|head|options)\(\s*'
+        r'(?:path\s*=\s*)?[rfu]?["\']([^"\']+)', re.I)
+    
     def chunk(self, code: str, file_path: str) -> List[ChunkInfo]:
         info(f"Chunking API code in {file_path}")
         chunks = []
@@ -45,11 +69,12 @@ class ApiChunkingStrategy(BaseChunkingStrategy):
         in_api_block = False
         start_line = 0
         
-        for i, line in enumerate(code.splitlines(), 1):
+        lines = code.splitlines()
+        for i, line in enumerate(lines, 1):
             stripped = line.strip()
             
             # Detect API patterns
-            if any(pattern in stripped for pattern in ['@app.', '@router.', 'app.get', 'app.post']):
+            if self.API_PATTERN.search(stripped):
                 if current_lines:  # Save previous non-API chunk
                     content = '\n'.join(current_lines)
                     chunks.append(ChunkInfo(
@@ -77,7 +102,7 @@ class ApiChunkingStrategy(BaseChunkingStrategy):
                         type='api',
                         start_line=start_line,
                         end_line=i,
-                        metadata={'api_type': 'endpoint'}
+                        metadata=self._api_metadata(content)
                     ))
                     current_lines = []
                     in_api_block = False
@@ -93,13 +118,24 @@ class ApiChunkingStrategy(BaseChunkingStrategy):
                 content=content,
                 language='python',
                 chunk_id=self._generate_chunk_id(content, file_path),
-                type='code',
+                # An endpoint running to the end of the code has no closing blank line
+                type='api' if in_api_block else 'code',
                 start_line=start_line,
-                end_line=len(code.splitlines())
+                end_line=len(lines),
+                metadata=self._api_metadata(content) if in_api_block else {}
             ))
             
         info(f"Created {len(chunks)} API chunks for {file_path}")
         return chunks
+    
+    def _api_metadata(self, content: str) -> Dict:
+        """Build endpoint metadata, including the route's method and path when present"""
+        metadata = {'api_type': 'endpoint'}
+        route = self.ROUTE_PATTERN.search(content)
+        if route:
+            metadata['method'] = route.group(1).upper()
+            metadata['path'] = route.group(2)
+        return metadata
 
 class LogicalChunkingStrategy(BaseChunkingStrategy):
     """Strategy for logical code blocks (functions, classes)"""
@@ -110,7 +146,8 @@ class LogicalChunkingStrategy(BaseChunkingStrategy):
         current_lines = []
         start_line = 1
         
-        for i, line in enumerate(code.splitlines(), 1):
+        lines = code.splitlines()
+        for i, line in enumerate(lines, 1):
             stripped = line.strip()
             
             # Detect new logical block
@@ -142,7 +179,7 @@ class LogicalChunkingStrategy(BaseChunkingStrategy):
                 chunk_id=self._generate_chunk_id(content, file_path),
                 type=chunk_type,
                 start_line=start_line,
-                end_line=len(code.splitlines())
+                end_line=len(lines)
             ))
         
         info(f"Created {len(chunks)} logical chunks for {file_path}")
@@ -167,7 +204,8 @@ class ImportChunkingStrategy(BaseChunkingStrategy):
         start_line = 1
         in_imports = False
         
-        for i, line in enumerate(code.splitlines(), 1):
+        lines = code.splitlines()
+        for i, line in enumerate(lines, 1):
             stripped = line.strip()
             
             if stripped.startswith(('import ', 'from ')):
@@ -220,7 +258,7 @@ class ImportChunkingStrategy(BaseChunkingStrategy):
                 chunk_id=self._generate_chunk_id(content, file_path),
                 type='import',
                 start_line=start_line,
-                end_line=len(code.splitlines()),
+                end_line=len(lines),
                 imports=set(imp.strip() for imp in current_imports)
             ))
         
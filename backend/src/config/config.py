@@ -2,25 +2,26 @@ import os
 from dotenv import load_dotenv
 
 load_dotenv()
+env = os.environ
 
 # Vector store configuration
-QDRANT_HOST = os.getenv("QDRANT_HOST")
-QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
+QDRANT_HOST = env.get("QDRANT_HOST")
+QDRANT_API_KEY = env.get("QDRANT_API_KEY")
 
 # OpenAI configuration
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_API_KEY = env.get("OPENAI_API_KEY")
 
 # Azure OpenAI configuration
-AZURE_OPENAI_MODEL = os.getenv("AZURE_OPENAI_MODEL")
-AZURE_OPENAI_KEY = os.getenv("AZURE_OPENAI_KEY")
-AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
+AZURE_OPENAI_MODEL = env.get("AZURE_OPENAI_MODEL")
+AZURE_OPENAI_KEY = env.get("AZURE_OPENAI_KEY")
+AZURE_OPENAI_ENDPOINT = env.get("AZURE_OPENAI_ENDPOINT")
 
 #Dynamo DB configuration
-AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
-AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-AWS_DEFAULT_REGION = os.getenv("AWS_DEFAULT_REGION")
-USE_LOCAL_DYNAMODB = os.getenv("USE_LOCAL_DYNAMODB")
-DYNAMODB_LOCAL_ENDPOINT = os.getenv("DYNAMODB_LOCAL_ENDPOINT")
+AWS_ACCESS_KEY_ID = env.get("AWS_ACCESS_KEY_ID")
+AWS_SECRET_ACCESS_KEY = env.get("AWS_SECRET_ACCESS_KEY")
+AWS_DEFAULT_REGION = env.get("AWS_DEFAULT_REGION")
+USE_LOCAL_DYNAMODB = env.get("USE_LOCAL_DYNAMODB")
+DYNAMODB_LOCAL_ENDPOINT = env.get("DYNAMODB_LOCAL_ENDPOINT")
 
 # Validate required environment variables
 required_vars = [
@@ -29,6 +30,6 @@ required_vars = [
     "OPENAI_API_KEY"
 ]
 
-missing_vars = [var for var in required_vars if not os.getenv(var)]
+missing_vars = [var for var in required_vars if not env.get(var)]
 if missing_vars:
     raise EnvironmentError(f"Missing required environment variables: {', '.join(missing_vars)}")
\ No newline at end of file
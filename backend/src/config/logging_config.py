@@ -55,18 +55,19 @@ def get_request_id():
     """Get the current request ID"""
     return getattr(_request_context, 'request_id', None)
 
-# Simple logging functions that use our configured logger
-def debug(message):
-    logger.debug(message)
+# Simple logging functions that use our configured logger.
+# Extra args are %-formatted by logging only if the level is enabled, so hot paths can skip the formatting cost.
+def debug(message, *args):
+    logger.debug(message, *args)
 
-def info(message):
-    logger.info(message)
+def info(message, *args):
+    logger.info(message, *args)
 
-def warning(message):
-    logger.warning(message)
+def warning(message, *args):
+    logger.warning(message, *args)
 
-def error(message):
-    logger.error(message)
+def error(message, *args):
+    logger.error(message, *args)
     
 # Log that the logging configuration has been initialized
 info("Logging configuration initialized")
\ No newline at end of file
@@ -1,4 +1,5 @@
 from enum import Enum
+from functools import lru_cache
 from typing import List, Dict, Union
 from deepeval import evaluate
 from deepeval.metrics import AnswerRelevancyMetric, FaithfulnessMetric, ContextualRelevancyMetric
@@ -9,6 +10,11 @@ class EvaluationMetric(Enum):
     FAITHFULNESS = 2
     CONTEXT_RELEVANCY = 3
 
+@lru_cache(maxsize=None)
+def _metric(metric_class, threshold: float, model: str):
+    """Return a shared metric instance for the given configuration"""
+    return metric_class(threshold=threshold, model=model, include_reason=True)
+
 class Evaluation:
     _evaluation_map = {
         EvaluationMetric.ANSWER_RELEVANCY: AnswerRelevancyMetric,
@@ -29,15 +35,12 @@ class Evaluation:
         Returns:
             Dict[str,Dict[str,Union[str,int]]]: Dict of metrics output containing score and reason
         """
-        metric_input_list = []
-        for metric in metrics:
-            metric_input_list.append(
-                Evaluation._evaluation_map[metric](
-                    threshold=0.7,
-                    model="gpt-3.5-turbo",
-                    include_reason=True
-                )
-            )
+        if not metrics:
+            return {}
+        metric_input_list = [
+            _metric(Evaluation._evaluation_map[metric], 0.7, "gpt-3.5-turbo")
+            for metric in metrics
+        ]
 
         test_case = LLMTestCase(
             input=request,
@@ -1,7 +1,9 @@
-from typing import Dict, List, Union
+import asyncio
+from typing import Dict, List, Optional, Union
 from evaluation.metrics.enums import LLMMetricType, NonLLMMetricType
 from evaluation.metrics.llm_metrics import LLMMetricEvaluator
 from evaluation.metrics.non_llm_metrics import NonLLMMetricEvaluator
+from evaluation.metrics.utility import TextProcessing
 
 class Evaluator:
     def __init__(
@@ -15,6 +17,14 @@ class Evaluator:
         self.non_llm_metrics = non_llm_metrics
         self.llm_threshold = llm_threshold
         self.llm_model = llm_model
+        # Evaluators are stateless between calls, so build them once per Evaluator
+        self.text_processor = TextProcessing()
+        self._llm_evaluator = (
+            LLMMetricEvaluator(llm_metrics, llm_threshold, llm_model) if llm_metrics else None
+        )
+        self._non_llm_evaluator = (
+            NonLLMMetricEvaluator(non_llm_metrics, self.text_processor) if non_llm_metrics else None
+        )
 
     def evaluate(
         self,
@@ -34,20 +44,54 @@ class Evaluator:
         Returns:
             Dictionary containing evaluation results for each metric
         """
-        evaluators = []
-        if use_llm and self.llm_metrics:
-            evaluators.append(
-                LLMMetricEvaluator(self.llm_metrics, self.llm_threshold, self.llm_model)
-            )
-
-        if self.non_llm_metrics:
-            evaluators.append(
-                NonLLMMetricEvaluator(self.non_llm_metrics)
-            )
-            
         results = {}
-        for evaluator in evaluators:
+        cached = self._token_sets(request, contexts)
+        for evaluator in self._evaluators(use_llm):
             results.update(
-                evaluator.evaluate(request, contexts, response)
+                evaluator.evaluate(request, contexts, response, cached=cached)
             )
-        return results
\ No newline at end of file
+        return results
+
+    async def aevaluate(
+        self,
+        use_llm: bool,
+        request: str,
+        contexts: List[str],
+        response: str
+    ) -> Dict[str, Dict[str, Union[float, str]]]:
+        """
+        Evaluate like evaluate(), running the LLM and non-LLM evaluators concurrently
+
+        Args:
+            request: User query
+            context: Retrieved context
+            response: Generated response
+
+        Returns:
+            Dictionary containing evaluation results for each metric
+        """
+        cached = self._token_sets(request, contexts)
+        results_list = await asyncio.gather(*(
+            asyncio.to_thread(evaluator.evaluate, request, contexts, response, cached=cached)
+            for evaluator in self._evaluators(use_llm)
+        ))
+        results = {}
+        for evaluator_results in results_list:
+            results.update(evaluator_results)
+        return results
+
+    def _token_sets(self, request: str, contexts: List[str]) -> Optional[Dict]:
+        """Tokenize the request and contexts once for every metric that needs them"""
+        if not self._non_llm_evaluator:
+            return None
+        return self._non_llm_evaluator.token_sets(request, contexts)
+
+    def _evaluators(self, use_llm: bool) -> list:
+        """Evaluators that apply to a request"""
+        evaluators = []
+        if use_llm and self._llm_evaluator:
+            evaluators.append(self._llm_evaluator)
+
+        if self._non_llm_evaluator:
+            evaluators.append(self._non_llm_evaluator)
+        return evaluators
@@ -1,4 +1,4 @@
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
 from deepeval import evaluate
 from deepeval.metrics import AnswerRelevancyMetric, FaithfulnessMetric, ContextualRelevancyMetric
 from deepeval.test_case import LLMTestCase
@@ -15,26 +15,29 @@ class LLMMetricEvaluator(BaseMetric):
             LLMMetricType.FAITHFULNESS: FaithfulnessMetric,
             LLMMetricType.CONTEXT_RELEVANCY: ContextualRelevancyMetric,
         }
+        self._metric_instances = None  # Built on first evaluation and reused afterwards
 
-    def evaluate(self, request: str, context:List[str], response: str) -> Dict[str, Dict[str, Union[float, str]]]:
+    def evaluate(self, request: str, context:List[str], response: str, *, cached: Optional[Dict] = None) -> Dict[str, Dict[str, Union[float, str]]]:
         """Evaluates llm metrics using request, contexts and the reponse by LLM
 
         Args:
             query: User question
             contexts: List of retrieved contexts
             response: Generated response
+            cached: Precomputed token sets, unused by LLM metrics
 
         Returns:
             Dict[str, Dict[str, Union[float, str]]]: evals dict
         """
-        metric_input_list = [
-            self.metric_map[metric](
-                threshold=self.threshold,
-                model=self.model,
-                include_reason=True
-            )
-            for metric in self.metrics
-        ]
+        if self._metric_instances is None:
+            self._metric_instances = [
+                self.metric_map[metric](
+                    threshold=self.threshold,
+                    model=self.model,
+                    include_reason=True
+                )
+                for metric in self.metrics
+            ]
 
         test_case = LLMTestCase(
             input=request,
@@ -44,7 +47,7 @@ class LLMMetricEvaluator(BaseMetric):
 
         evaluation_result = evaluate(
             test_cases=[test_case],
-            metrics=metric_input_list,
+            metrics=self._metric_instances,
             print_results=False,
             write_cache=False
         )
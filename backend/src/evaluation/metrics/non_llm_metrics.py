@@ -1,12 +1,19 @@
-from typing import Dict, List, Union
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
+from functools import lru_cache
 from .base import BaseMetric
 from .enums import NonLLMMetricType
 from .utility import TextProcessing, TextSimilarity, TextStats
 
+@lru_cache(maxsize=256)
+def _context_phrases(context: str) -> Tuple[str, ...]:
+    """Split a context into its lowercase phrases longer than 10 characters"""
+    phrases = (p.strip() for p in context.lower().split('.'))
+    return tuple(p for p in phrases if len(p) > 10)
+
 class NonLLMMetricEvaluator(BaseMetric):
-    def __init__(self, metrics: List[NonLLMMetricType]):
+    def __init__(self, metrics: List[NonLLMMetricType], text_processor: Optional[TextProcessing] = None):
         self.metrics = metrics
-        self.text_processor = TextProcessing()
+        self.text_processor = text_processor or TextProcessing()
         self.text_similarity = TextSimilarity()
         self.text_stats = TextStats()
         self.metric_map = {
@@ -17,21 +24,32 @@ class NonLLMMetricEvaluator(BaseMetric):
             NonLLMMetricType.SOURCE_DIVERSITY: self._calculate_source_diversity
         }
 
-    def evaluate(self, request: str, contexts: List[str], response: str) -> Dict[str, Dict[str, Union[float, str]]]:
+    def token_sets(self, request: str, contexts: List[str]) -> Dict[str, Union[FrozenSet[str], List[FrozenSet[str]]]]:
+        """Cleaned token sets of the request, each context and all contexts combined, shared by all metrics"""
+        context_tokens = [self.text_processor.tokenize_and_clean(context) for context in contexts]
+        return {
+            "request": self.text_processor.tokenize_and_clean(request),
+            "contexts": context_tokens,
+            "merged": frozenset().union(*context_tokens)
+        }
+
+    def evaluate(self, request: str, contexts: List[str], response: str, *, cached: Optional[Dict] = None) -> Dict[str, Dict[str, Union[float, str]]]:
         """Evaluates non-llm metrics using request, contexts and the reponse by LLM
 
         Args:
             query: User question
             contexts: List of retrieved contexts
             response: Generated response
+            cached: Precomputed token_sets() for the same request and contexts
 
         Returns:
             Dict[str, Dict[str, Union[float, str]]]: evals dict
         """
         results = {}
+        tokens = cached if cached is not None else self.token_sets(request, contexts)
 
         for metric in self.metrics:
-            score = self.metric_map[metric](request, contexts, response)
+            score = self.metric_map[metric](request, contexts, response, tokens)
             results[metric.value] = {
                 "score": score,
                 "reason": self._get_reason(metric, score)
@@ -39,7 +57,7 @@ class NonLLMMetricEvaluator(BaseMetric):
 
         return results
 
-    def _calculate_context_query_match(self, query: str, contexts: List[str], response:str) -> float:
+    def _calculate_context_query_match(self, query: str, contexts: List[str], response:str, tokens: Dict) -> float:
         """
         Calculate how well contexts match the query
         
@@ -47,26 +65,21 @@ class NonLLMMetricEvaluator(BaseMetric):
             query: User question
             contexts: List of retrieved contexts
             response: Generated response
+            tokens: token_sets() of the query and contexts
         Returns:
             Match score between 0 and 1
         """
         if not contexts:
             return 0.0
             
-        query_terms = self.text_processor.tokenize_and_clean(query)
+        query_terms = tokens["request"]
         if not query_terms:
             return 0.0
             
-        scores = []
-        for context in contexts:
-            context_terms = self.text_processor.tokenize_and_clean(context)
-            if context_terms:
-                score = self.text_similarity.calculate_overlap_score(query_terms, context_terms)
-                scores.append(score)
-                
-        return sum(scores) / len(contexts) if scores else 0.0
+        scores = self.text_similarity.overlap_score_batch(query_terms, tokens["contexts"])
+        return sum(scores) / len(contexts)
     
-    def _calculate_answer_coverage(self, query:str, contexts: List[str], response: str) -> float:
+    def _calculate_answer_coverage(self, query:str, contexts: List[str], response: str, tokens: Dict) -> float:
         """
         Calculate what percentage of contexts are used in the response
         
@@ -84,17 +97,14 @@ class NonLLMMetricEvaluator(BaseMetric):
         response_lower = response.lower()
         
         for context in contexts:
-            context_phrases = [p.strip() for p in context.lower().split('.') 
-                             if len(p.strip()) > 10]
-            
-            for phrase in context_phrases:
+            for phrase in _context_phrases(context):
                 if self.text_processor.is_substring_match(phrase, response_lower):
                     covered_contexts += 1
                     break
                     
         return covered_contexts / len(contexts)
     
-    def _calculate_response_consistency(self, query:str, contexts: List[str], response: str) -> float:
+    def _calculate_response_consistency(self, query:str, contexts: List[str], response: str, tokens: Dict) -> float:
         """
         Calculate how consistent the response is with contexts
         
@@ -102,6 +112,7 @@ class NonLLMMetricEvaluator(BaseMetric):
             query: User question
             contexts: List of retrieved contexts
             response: Generated response
+            tokens: token_sets() of the query and contexts
         Returns:
             Consistency score between 0 and 1
         """
@@ -115,15 +126,21 @@ class NonLLMMetricEvaluator(BaseMetric):
         consistent_facts = 0
         for fact in response_facts:
             fact_words = self.text_processor.tokenize_and_clean(fact)
-            for context in contexts:
-                context_words = self.text_processor.tokenize_and_clean(context)
-                if self.text_similarity.calculate_overlap_score(fact_words, context_words) > 0.7:
+            if not fact_words:
+                continue
+            # overlap / len(fact_words) > 0.7, kept in integers inside the hot loop
+            required = 7 * len(fact_words)
+            # No single context can overlap more than all of them together
+            if 10 * len(fact_words & tokens["merged"]) <= required:
+                continue
+            for context_words in tokens["contexts"]:
+                if 10 * len(fact_words & context_words) > required:
                     consistent_facts += 1
                     break
                     
         return consistent_facts / len(response_facts)
     
-    def _calculate_information_density(self, query:str, contexts: List[str], response: str) -> float:
+    def _calculate_information_density(self, query:str, contexts: List[str], response: str, tokens: Dict) -> float:
         """
         Calculate ratio of factual content to response length
         
@@ -147,7 +164,7 @@ class NonLLMMetricEvaluator(BaseMetric):
         
         return fact_words / total_words if total_words > 0 else 0.0
     
-    def _calculate_source_diversity(self, query:str, contexts: List[str], response: str) -> float:
+    def _calculate_source_diversity(self, query:str, contexts: List[str], response: str, tokens: Dict) -> float:
         """
         Calculate how many different contexts contribute to the response
         
@@ -165,10 +182,7 @@ class NonLLMMetricEvaluator(BaseMetric):
         unique_sources = set()
         
         for i, context in enumerate(contexts):
-            context_phrases = [p.strip() for p in context.lower().split('.') 
-                             if len(p.strip()) > 10]
-            
-            for phrase in context_phrases:
+            for phrase in _context_phrases(context):
                 if self.text_processor.is_substring_match(phrase, response_lower):
                     unique_sources.add(i)
                     break
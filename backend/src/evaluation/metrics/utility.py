@@ -1,27 +1,45 @@
 import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
 from nltk.corpus import stopwords
-from typing import Set, List
+from typing import FrozenSet, Set, List
+from functools import lru_cache
 import re
+from config.logging_config import info
 
 def ensure_nltk_downloads():
     """
     Ensure all required NLTK data is downloaded.
     Downloads required data if not already present.
     """
-    required_packages = ['punkt', 'stopwords', 'punkt_tab']
-    for package in required_packages:
+    required_packages = {
+        'stopwords': 'corpora/stopwords',
+    }
+    for package, resource in required_packages.items():
         try:
-            nltk.data.find(f'tokenizers/{package}')
+            nltk.data.find(resource)
         except LookupError:
-            print(f"Downloading required NLTK package: {package}")
+            info(f"Downloading required NLTK package: {package}")
             nltk.download(package, quiet=True)
 
 ensure_nltk_downloads()
 
+# English stop words, loaded from the NLTK corpus once and shared by every TextProcessing
+_STOP_WORDS = frozenset(stopwords.words('english'))
+
+# Runs of letters and digits; the tokens word_tokenize produced that survived the isalnum filter
+_WORD_RE = re.compile(r'[^\W_]+')
+# Sentence boundaries, and the verbs that typically mark a factual statement
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_FACT_RE = re.compile(r'\b(?:is|was|has|have|contains)\b', re.IGNORECASE)
+
+@lru_cache(maxsize=4096)
+def _tokenize_and_clean(text: str, stop_words: FrozenSet[str]) -> FrozenSet[str]:
+    """Lowercase word tokens of text that are not stop words, cached per text"""
+    return frozenset(token for token in _WORD_RE.findall(text.lower())
+                     if token not in stop_words)
+
 class TextProcessing:
     def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
+        self.stop_words = _STOP_WORDS
     
     def tokenize_and_clean(self, text: str) -> Set[str]:
         """
@@ -33,9 +51,7 @@ class TextProcessing:
         Returns:
             Set of cleaned tokens
         """
-        tokens = word_tokenize(text.lower())
-        return {token for token in tokens 
-                if token.isalnum() and token not in self.stop_words}
+        return _tokenize_and_clean(text, self.stop_words)
     
     def extract_facts(self, text: str) -> List[str]:
         """
@@ -47,15 +63,8 @@ class TextProcessing:
         Returns:
             List of extracted factual statements
         """
-        sentences = sent_tokenize(text)
-        facts = []
-        
-        for sentence in sentences:
-            # Look for patterns that typically indicate facts
-            if re.search(r'\bis\b|\bwas\b|\bhas\b|\bhave\b|\bcontains\b', sentence.lower()):
-                facts.append(sentence)
-                
-        return facts
+        return [sentence for sentence in _SENTENCE_SPLIT_RE.split(text.strip())
+                if _FACT_RE.search(sentence)]
     
     def is_substring_match(self, shorter: str, longer: str) -> bool:
         """
@@ -69,14 +78,24 @@ class TextProcessing:
             Boolean indicating if match found
         """
         shorter_words = self.tokenize_and_clean(shorter)
-        longer_words = self.tokenize_and_clean(longer)
-        
         if not shorter_words:
             return False
+        longer_words = self.tokenize_and_clean(longer)
             
-        # Check if significant portion of shorter text appears in longer text
-        overlap = len(shorter_words & longer_words)
-        return overlap / len(shorter_words) > 0.7
+        # Check if significant portion (over 70%) of shorter text appears in longer text,
+        # stopping as soon as the outcome is decided
+        needed = len(shorter_words) * 7 // 10 + 1
+        hits = 0
+        remaining = len(shorter_words)
+        for word in shorter_words:
+            remaining -= 1
+            if word in longer_words:
+                hits += 1
+                if hits >= needed:
+                    return True
+            elif hits + remaining < needed:
+                return False
+        return False
 
 class TextSimilarity:
     @staticmethod
@@ -97,6 +116,25 @@ class TextSimilarity:
         overlap = len(set1 & set2)
         return overlap / len(set1)
 
+    @staticmethod
+    def overlap_score_batch(query_set: Set[str], doc_sets: List[Set[str]]) -> List[float]:
+        """
+        Calculate the overlap score of one query against many documents
+        
+        Args:
+            query_set: Tokens of the query
+            doc_sets: Tokens of each document
+            
+        Returns:
+            Overlap score between 0 and 1 for each document, in order
+        """
+        if not query_set:
+            return [0.0] * len(doc_sets)
+        
+        query_size = len(query_set)
+        intersection = query_set.intersection
+        return [len(intersection(doc)) / query_size if doc else 0.0 for doc in doc_sets]
+
 class TextStats:
     @staticmethod
     def word_count(text: str) -> int:
@@ -109,4 +147,4 @@ class TextStats:
         Returns:
             Number of words
         """
-        return len(word_tokenize(text))
\ No newline at end of file
+        return len(_WORD_RE.findall(text))
\ No newline at end of file
@@ -1,6 +1,13 @@
 import os
-from typing import List, Dict, Any, Optional, Tuple
+import copy
+import hashlib
+import pickle
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import Counter
+from itertools import islice
+from operator import attrgetter
 # Replace standard logging with our custom logging
 from config.logging_config import info, error, warning, debug
 import tree_sitter
@@ -16,25 +23,126 @@ from .language_specific_parsing.javascript_parser import JavaScriptParser
 from .language_specific_parsing.python_parser import PythonParser
 from .language_specific_parsing.typescript_parser import TypeScriptParser
 from chunking.chunk_manager import ChunkManager
-from chunking.strategies import ChunkInfo
+from chunking.strategies import ChunkInfo, chunk_id_for
+from chunking.parallel import bounded_map, WINDOW_PER_WORKER
+
+_type_of = attrgetter('type')
+
+# Per-process parser used by the pool workers in CodeParser.parse_directory
+_worker_parser = None
+
+def _parse_file_worker(file_path: str) -> Tuple[str, Dict[str, Any]]:
+    """Parse a single file inside a pool worker, reusing one CodeParser per process"""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = CodeParser()
+    return file_path, _worker_parser.parse_file(file_path)
+
+def _available_cpus() -> int:
+    """CPUs this process may run on, which can be fewer than the machine has (containers, taskset)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+def _replace_ids(value: Any, new_ids: Dict[str, str]) -> Any:
+    """Copy of a metadata value with every chunk id found in new_ids replaced"""
+    if isinstance(value, str):
+        return new_ids.get(value, value)
+    if isinstance(value, dict):
+        return {key: _replace_ids(item, new_ids) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return type(value)(_replace_ids(item, new_ids) for item in value)
+    return value
+
+class ParseSummary:
+    """Running counts of parsed files, entities and chunks, fed one file at a time"""
+    
+    def __init__(self):
+        self.total_files = 0
+        self.by_language = Counter()
+        self.entity_types = Counter()
+        self.chunk_types = Counter()
+        self.total_entities = 0
+        self.total_chunks = 0
+    
+    def add(self, file_data: Dict[str, Any]):
+        """Account for one file's parse result"""
+        if not isinstance(file_data, dict):
+            return
+        self.total_files += 1
+        if 'language' not in file_data:
+            return
+        self.by_language[file_data['language']] += 1
+        
+        entities = file_data.get('entities', [])
+        chunks = file_data.get('chunks', [])
+        
+        self.total_entities += len(entities)
+        self.total_chunks += len(chunks)
+        
+        # Count by type
+        self.entity_types.update(map(_type_of, entities))
+        self.chunk_types.update(map(_type_of, chunks))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total_files': self.total_files,
+            'by_language': dict(self.by_language),
+            'total_entities': self.total_entities,
+            'total_chunks': self.total_chunks,
+            'by_type': {
+                'entities': dict(self.entity_types),
+                'chunks': dict(self.chunk_types)
+            }
+        }
 
 class CodeParser:
     """Main parser that integrates all language parsers"""
-      
-    def __init__(self):
-        self.LANGUAGE_MAPPING = {
+    
+    # Directories never worth descending into while walking a repository
+    EXCLUDED_DIRS = frozenset({
+        "node_modules", "venv", ".venv", "env", "__pycache__", ".git",
+        "dist", "build", "target", "bin", "obj", ".next",
+        "vendor", "bower_components", ".idea",
+        ".vscode", ".ipynb_checkpoints"
+    })
+    # Files we never chunk: documents are handled by DocumentChunker, the rest is binary
+    SKIPPED_EXTENSIONS = frozenset({
+        ".txt", ".md", ".rst", ".rtf", ".yaml", ".json",
+        ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".svg", ".webp",
+        ".pdf", ".zip", ".gz", ".tar", ".jar", ".war", ".whl", ".7z",
+        ".exe", ".dll", ".so", ".dylib", ".class", ".pyc", ".o", ".a",
+        ".woff", ".woff2", ".ttf", ".eot", ".mp3", ".mp4", ".mov", ".lock"
+    })
+    # Larger files are almost always generated or minified and make poor chunks
+    MAX_FILE_SIZE = 512 * 1024
+    # Parse results are stored by file content so re-indexing a repository skips unchanged files;
+    # bump PARSE_CACHE_VERSION whenever parser or chunker output changes
+    PARSE_CACHE_DIR = Path.home() / ".cache" / "codebase_rag"
+    PARSE_CACHE_VERSION = 1
+    
+    LANGUAGE_MAPPING = {
         '.py': ('python', PythonParser),
         '.js': ('javascript', JavaScriptParser),
         '.java': ('java', JavaParser),
         '.ts': ('typescript', TypeScriptParser),
         '.tsx': ('typescript', TypeScriptParser)
-        }
+    }
+      
+    def __init__(self, use_cache: bool = True):
         # Remove the logger initialization
+        self.use_cache = use_cache
         self.base_path = Path(__file__).parent.parent.parent / "tree_sitter_libs"
         self.parsers = self._initialize_parsers()
         self.chunk_manager = ChunkManager(self.parsers) 
+        # Resolve parser, chunker and language per extension once instead of on every file
+        self._handlers = {
+            ext: (parser, self.chunk_manager.chunkers.get(ext), self.chunk_manager.get_language(ext))
+            for ext, parser in self.parsers.items()
+        }
         
         self.doc_pattern = ['**/*.md', '**/*.txt', '**/*.rst']
+        # Code files handled by the most recent iter_directory call
         self.processed_files = set()
     
     def _initialize_parsers(self) -> Dict[str, BaseLanguageParser]:
@@ -45,7 +153,7 @@ class CodeParser:
         for ext, (lang, parser_class) in self.LANGUAGE_MAPPING.items():
             try:
                 build_path = str(build_dir / f"{lang}.so")
-                if ext in [".ts",".tsx"]:
+                if ext in {".ts",".tsx"}:
                     vendor_path = str(self.base_path / f"tree-sitter-{lang}/{lang}")
                 else:
                     vendor_path = str(self.base_path / f"tree-sitter-{lang}")
@@ -63,25 +171,29 @@ class CodeParser:
     def parse_file(self, file_path: str) -> Dict[str, Any]:
         """Parse a single file and create chunks"""
         try:
-            ext = Path(file_path).suffix
-            parser = self.parsers.get(ext)
-            if not parser:
+            ext = os.path.splitext(file_path)[1]
+            handler = self._handlers.get(ext)
+            if not handler:
                 raise ValueError(f"Unsupported file type: {ext}")
+            parser, chunker, language = handler
+            
+            # Read the source once: the parser consumes the bytes, the chunker the decoded text
+            content_bytes = Path(file_path).read_bytes()
+            content = content_bytes.decode('utf-8')
             
             # Parse entities
-            entities = parser.parse_file(file_path)
+            entities = parser.parse_file(file_path, content, content_bytes)
             
-            # Get appropriate chunker
-            chunker = self.chunk_manager.chunkers.get(ext)
+            # Make sure a chunker is available
             if not chunker:
                 raise ValueError(f"No chunker available for {ext} files")
             
             # Create chunks from the parsed entities first
-            chunks = chunker.create_chunks_from_entities(entities, file_path)
+            chunks = chunker.create_chunks_from_entities(entities, file_path, content)
             
             return {
                 'file_path': file_path,
-                'language': self.LANGUAGE_MAPPING[ext][0],
+                'language': language,
                 'file_type': "code_file",
                 'entities': entities,
                 'chunks': chunks
@@ -92,52 +204,187 @@ class CodeParser:
             error(f"Error parsing file {file_path}: {e}")
             return {}
     
-    def parse_directory(self, directory_path: str) -> Dict[str, Any]:
-        """Parse all supported files in a directory"""
-        results = {}
-        directory = Path(directory_path)
-        
+    def _iter_files(self, directory_path: str):
+        """Yield every file entry under directory_path with a single scandir walk"""
+        stack = [directory_path]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.EXCLUDED_DIRS:
+                                stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+            except OSError as e:
+                warning(f"Cannot scan directory {current}: {e}")
+
+    def iter_directory(self, directory_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (file_path, result) for every supported file as soon as it is parsed"""
         try:
-            # First process files with known parsers
-            for ext in self.parsers:
-                for file_path in directory.rglob(f"*{ext}"):
-                    file_result = self.parse_file(str(file_path))
-                    if file_result:
-                        results[str(file_path)] = file_result
-                    self.processed_files.add(file_path)
-            
-            excluded_dirs = {
-                            "node_modules", "venv", "env", "__pycache__", ".git", 
-                            "dist", "build", "target", "bin", "obj",
-                            "packages", "vendor", "bower_components", ".idea",
-                            ".vscode", ".ipynb_checkpoints"
-                        }
-            # Then process remaining files without specific parsers
-            for file_path in directory.rglob("*.*"):
-                # Skip already processed files
-                if file_path in self.processed_files:
+            # Walk the tree once and dispatch each file by its suffix
+            parser_paths = []
+            text_paths = []
+            for entry in self._iter_files(str(directory_path)):
+                ext = os.path.splitext(entry.name)[1]
+                # Only files with an extension that are worth chunking
+                if not ext or ext.lower() in self.SKIPPED_EXTENSIONS:
+                    continue
+                if entry.stat().st_size > self.MAX_FILE_SIZE:
+                    debug("Skipping large file %s", entry.path)
                     continue
                 
-                # Skip files in excluded directories
-                if any(excluded_dir in str(file_path).lower() for excluded_dir in excluded_dirs):
+                if ext in self.parsers:
+                    parser_paths.append(entry.path)
+                else:
+                    text_paths.append(entry.path)
+            
+            # Parse each distinct file content once; identical copies reuse the result
+            unique_paths, duplicates, digests = self._group_by_content(parser_paths)
+            
+            # Files whose content was parsed on an earlier run come straight from the cache
+            uncached_paths = []
+            for file_path in unique_paths:
+                file_result = self._load_cached(file_path, digests[file_path])
+                if file_result is None:
+                    uncached_paths.append(file_path)
                     continue
-                    
-                if file_path.is_file():
-                    if os.path.splitext(file_path)[1] in [".txt",".md",".rst",".rtf",".yaml",".json"]:
-                        continue
-                    file_result = self.process_file_as_text(str(file_path))
-                    
-                    if file_result:
-                        results[str(file_path)] = file_result        
-                        
-            # Add summary
-            results['summary'] = self._generate_summary(results)
-            return results
+                yield from self._with_duplicates(file_path, self._rebase_file_result(file_result, file_path), duplicates)
+            unique_paths = uncached_paths
+            
+            # First process files with known parsers, spread across worker processes
+            if unique_paths:
+                max_workers = min(_available_cpus(), len(unique_paths))
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    for file_path, file_result in bounded_map(
+                        executor, _parse_file_worker, unique_paths, max_workers * WINDOW_PER_WORKER
+                    ):
+                        if not file_result:
+                            continue
+                        self._store_cached(file_path, digests[file_path], file_result)
+                        yield from self._with_duplicates(file_path, file_result, duplicates)
+            # Only the latest directory is tracked, so a long-lived parser does not grow without bound
+            self.processed_files = set(parser_paths)
+            
+            # Then process remaining files without specific parsers; this is mostly file I/O,
+            # so threads overlap the reads while results still come back in order
+            if text_paths:
+                # Same sizing as ThreadPoolExecutor's default for I/O-bound work
+                max_workers = min(32, _available_cpus() + 4)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    text_results = bounded_map(
+                        executor, self.process_file_as_text, text_paths, max_workers * WINDOW_PER_WORKER
+                    )
+                    for file_path, file_result in zip(text_paths, text_results):
+                        if file_result:
+                            yield file_path, file_result
                         
         except Exception as e:
             # Replace self.logger.error with direct error function
             error(f"Error parsing directory {directory_path}: {e}")
-            return results
+
+    def parse_directory(self, directory_path: str) -> Dict[str, Any]:
+        """Parse all supported files in a directory"""
+        results = dict(self.iter_directory(directory_path))
+        # Add summary
+        results['summary'] = self._generate_summary(results)
+        return results
+        
+    def _group_by_content(self, file_paths: List[str]) -> Tuple[List[str], Dict[str, List[str]], Dict[str, bytes]]:
+        """Split paths into first occurrences and the duplicates sharing their content,
+        along with the content digest of each first occurrence"""
+        first_by_digest = {}
+        unique_paths = []
+        duplicates = {}
+        digests = {}
+        for file_path in file_paths:
+            try:
+                with open(file_path, 'rb') as f:
+                    digest = hashlib.sha256(f.read()).digest()
+            except OSError as e:
+                warning(f"Cannot read {file_path}: {e}")
+                continue
+            original = first_by_digest.setdefault(digest, file_path)
+            if original == file_path:
+                unique_paths.append(file_path)
+                digests[file_path] = digest
+            else:
+                duplicates.setdefault(original, []).append(file_path)
+        if duplicates:
+            info(f"Skipping parse of {sum(map(len, duplicates.values()))} duplicate files")
+        return unique_paths, duplicates, digests
+
+    def _with_duplicates(self, file_path: str, file_result: Dict[str, Any],
+                         duplicates: Dict[str, List[str]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield a parse result followed by copies for the files sharing its content"""
+        yield file_path, file_result
+        for duplicate_path in duplicates.get(file_path, ()):
+            yield duplicate_path, self._copy_file_result(file_result, duplicate_path)
+
+    def _cache_path(self, file_path: str, digest: bytes) -> Path:
+        """Cache entry for a file content; the extension picks the parser, so it is part of the key"""
+        ext = os.path.splitext(file_path)[1].lstrip('.')
+        return self.PARSE_CACHE_DIR / f"v{self.PARSE_CACHE_VERSION}-{digest.hex()}-{ext}.pkl"
+
+    def _load_cached(self, file_path: str, digest: bytes) -> Optional[Dict[str, Any]]:
+        """Return the stored parse result for this content, or None"""
+        if not self.use_cache:
+            return None
+        try:
+            with open(self._cache_path(file_path, digest), 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            warning(f"Ignoring unreadable parse cache entry for {file_path}: {e}")
+            return None
+
+    def _store_cached(self, file_path: str, digest: bytes, file_result: Dict[str, Any]):
+        """Persist a parse result; failures only cost a re-parse next time"""
+        if not self.use_cache:
+            return
+        cache_path = self._cache_path(file_path, digest)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            self.PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(file_result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Atomic rename so concurrent indexing runs never read a partial entry
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            warning(f"Cannot write parse cache entry for {file_path}: {e}")
+
+    def _copy_file_result(self, file_result: Dict[str, Any], file_path: str) -> Dict[str, Any]:
+        """Clone a parse result for a file with identical content at another path"""
+        return self._rebase_file_result(copy.deepcopy(file_result), file_path)
+
+    def _rebase_file_result(self, result: Dict[str, Any], file_path: str) -> Dict[str, Any]:
+        """Point a parse result at file_path in place: its path, every chunk id and every reference to one"""
+        original_path = result['file_path']
+        result['file_path'] = file_path
+        if original_path == file_path:
+            return result
+        
+        # Ids either start with the file path or hash it together with the chunk content
+        new_ids = {}
+        for chunk in result['chunks']:
+            old_id = chunk.chunk_id
+            if old_id.startswith(original_path):
+                new_id = file_path + old_id[len(original_path):]
+            elif old_id == chunk_id_for(chunk.content, original_path):
+                new_id = chunk_id_for(chunk.content, file_path)
+            else:
+                continue
+            new_ids[old_id] = chunk.chunk_id = new_id
+        
+        # Chunks refer to each other by id in their metadata (e.g. parent_chunk, interface_chunks)
+        for chunk in result['chunks']:
+            chunk.metadata = _replace_ids(chunk.metadata, new_ids)
+        for entity in result.get('entities', ()):
+            if entity.chunk_id in new_ids:
+                entity.chunk_id = new_ids[entity.chunk_id]
+        return result
         
     def process_file_as_text(self, file_path: str) -> Dict[str, Any]:
         """Process a file as plain text and chunk it for vector DB"""
@@ -150,9 +397,6 @@ class CodeParser:
                 # Skip binary files
                 return None
             
-            # Get file extension
-            ext = Path(file_path).suffix.lower()
-            
             # Create chunks for vector DB
             chunks = self.create_chunks_nonparser(content)
             
@@ -163,7 +407,7 @@ class CodeParser:
                 'chunks': chunks
             }
         except Exception as e:
-            print(f"Error processing {file_path}: {str(e)}")
+            error(f"Error processing {file_path}: {str(e)}")
             return None
         
     # create Chunks for Non parser files like we not yet implimented html, kotlin like that we pasre those files as text files
@@ -173,103 +417,66 @@ class CodeParser:
             return []
             
         lines = content.split('\n')
+        # Offset of each line in content, so chunk text is sliced once instead of re-joined from lines
+        offsets = [0]
+        for line in lines:
+            offsets.append(offsets[-1] + len(line) + 1)
+        
         chunks = []
-        current_chunk = []
+        append_chunk = chunks.append
+        chunk_start = 0
         current_size = 0
         chunk_id = 0
-        last_chunk_end = 0
         
         # Extract potential title from first line
         document_title = lines[0] if lines else ""
         
+        def make_chunk(start: int, end: int) -> Dict[str, Any]:
+            # Find section headers in chunk for better metadata
+            section_title = next((l for l in islice(lines, start, end)
+                                  if l.strip() and (l.isupper() or l.endswith(':'))), "")
+            return {
+                'chunk_id': f"{filename}_{chunk_id}" if filename else chunk_id,
+                'content': content[offsets[start]:offsets[end] - 1],
+                'start_line': start,
+                'end_line': end - 1,
+                'document_title': document_title,
+                'section_title': section_title,
+                'filename': filename
+            }
+        
         for i, line in enumerate(lines):
             line_size = len(line)
             
             # If adding this line would exceed max chunk size, create a new chunk
-            if current_size + line_size > max_chunk_size and current_chunk:
-                chunk_text = '\n'.join(current_chunk)
-                
-                # Find section headers in chunk for better metadata
-                section_headers = [l for l in current_chunk if l.strip() and (l.isupper() or l.endswith(':'))]
-                section_title = section_headers[0] if section_headers else ""
-                
-                chunks.append({
-                    'chunk_id': f"{filename}_{chunk_id}" if filename else chunk_id,
-                    'content': chunk_text,
-                    'start_line': last_chunk_end,
-                    'end_line': i - 1,
-                    'document_title': document_title,
-                    'section_title': section_title,
-                    'filename': filename
-                })
+            if current_size + line_size > max_chunk_size and i > chunk_start:
+                append_chunk(make_chunk(chunk_start, i))
                 chunk_id += 1
                 
-                # Calculate overlap based on character count
+                # Calculate overlap based on character count, walking back from the end
                 overlap_size = 0
-                overlap_lines = []
-                for prev_line in reversed(current_chunk):
-                    if overlap_size + len(prev_line) > overlap:
+                overlap_start = i
+                while overlap_start > chunk_start:
+                    prev_size = len(lines[overlap_start - 1])
+                    if overlap_size + prev_size > overlap:
                         break
-                    overlap_lines.insert(0, prev_line)
-                    overlap_size += len(prev_line)
+                    overlap_start -= 1
+                    overlap_size += prev_size
                     
-                current_chunk = overlap_lines.copy()
-                current_size = sum(len(l) for l in current_chunk)
-                last_chunk_end = i - len(overlap_lines)
+                chunk_start = overlap_start
+                current_size = overlap_size
                     
-            current_chunk.append(line)
             current_size += line_size
             
         # Add the last chunk if not empty
-        if current_chunk:
-            chunk_text = '\n'.join(current_chunk)
-            
-            section_headers = [l for l in current_chunk if l.strip() and (l.isupper() or l.endswith(':'))]
-            section_title = section_headers[0] if section_headers else ""
-            
-            chunks.append({
-                'chunk_id': f"{filename}_{chunk_id}" if filename else chunk_id,
-                'content': chunk_text,
-                'start_line': last_chunk_end,
-                'end_line': len(lines) - 1,
-                'document_title': document_title,
-                'section_title': section_title,
-                'filename': filename
-            })
+        if chunk_start < len(lines):
+            append_chunk(make_chunk(chunk_start, len(lines)))
             
         return chunks
 
     def _generate_summary(self, results: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate summary of parsing results"""
-        summary = {
-            'total_files': len(results) - 1,  # Subtract 1 for summary key
-            'by_language': {},
-            'total_entities': 0,
-            'total_chunks': 0,
-            'by_type': {
-                'entities': {},
-                'chunks': {}
-            }
-        }
-
+        """Generate summary of parsing results in a single pass"""
+        summary = ParseSummary()
         for file_data in results.values():
-            if isinstance(file_data, dict) and 'language' in file_data:
-                lang = file_data['language']
-                summary['by_language'][lang] = summary['by_language'].get(lang, 0) + 1
-                
-                entities = file_data.get('entities', [])
-                chunks = file_data.get('chunks', [])
-                
-                summary['total_entities'] += len(entities)
-                summary['total_chunks'] += len(chunks)
-                
-                # Count by type
-                for entity in entities:
-                    summary['by_type']['entities'][entity.type] = \
-                        summary['by_type']['entities'].get(entity.type, 0) + 1
-                
-                for chunk in chunks:
-                    summary['by_type']['chunks'][chunk.type] = \
-                        summary['by_type']['chunks'].get(chunk.type, 0) + 1
-
-        return summary
\ No newline at end of file
+            summary.add(file_data)
+        return summary.to_dict()
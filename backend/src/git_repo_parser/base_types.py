@@ -1,6 +1,7 @@
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
+import threading
 import tree_sitter
 # Replace standard logging with our custom logging
 from config.logging_config import info, error, warning, debug
@@ -38,7 +39,18 @@ class CodeEntity:
 class BaseLanguageParser(ABC):
     def __init__(self, build_path: str, vendor_path: str):
         # Remove the logger initialization
-        self.parser = self._initialize_parser(build_path, vendor_path)
+        # tree-sitter parsers are not safe to share between threads, so each thread gets its own
+        self._tls = threading.local()
+        self._tls.parser = self._initialize_parser(build_path, vendor_path)
+    
+    @property
+    def parser(self) -> tree_sitter.Parser:
+        """This thread's tree-sitter parser, created on first use"""
+        parser = getattr(self._tls, 'parser', None)
+        if parser is None:
+            parser = self._tls.parser = tree_sitter.Parser()
+            parser.set_language(self.language)
+        return parser
         
     def _initialize_parser(self, build_path: str, vendor_path: str) -> tree_sitter.Parser:
         try:
@@ -52,6 +64,7 @@ class BaseLanguageParser(ABC):
             parser = tree_sitter.Parser()
             language = tree_sitter.Language(build_path, self.get_language_name())
             parser.set_language(language)
+            self.language = language
             return parser
             
         except Exception as e:
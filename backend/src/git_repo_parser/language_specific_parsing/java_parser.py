@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Tuple
+import sys
+from typing import Any, Dict, List, Optional, Tuple
 from ..base_types import BaseLanguageParser, CodeEntity, CodeLocation, StringLiteral
 # Import direct logging functions
 from config.logging_config import info, error, warning, debug
@@ -11,12 +12,17 @@ class JavaParser(BaseLanguageParser):
         """Parse code content using tree-sitter"""
         return self.parser.parse(content)
 
-    def parse_file(self, file_path: str) -> List[CodeEntity]:
+    def parse_file(self, file_path: str, content: Optional[str] = None, content_bytes: Optional[bytes] = None) -> List[CodeEntity]:
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-            self.code = content
-            tree = self.parser.parse(bytes(content, 'utf-8'))
+            # tree-sitter works on bytes, so only encode when the caller did not already read them
+            if content_bytes is None:
+                if content is None:
+                    with open(file_path, 'rb') as file:
+                        content_bytes = file.read()
+                else:
+                    content_bytes = content.encode('utf-8')
+            self.code_bytes = content_bytes
+            tree = self.parser.parse(self.code_bytes)
             entities = self.extract_entities(tree.root_node)
             return entities
         except Exception as e:
@@ -32,11 +38,11 @@ class JavaParser(BaseLanguageParser):
             for entity_node in node.children:
                 if entity_node.type in node_types:
                     name_node = self.get_child_by_field_name(entity_node, "name")
-                    name = name_node.text.decode("utf-8") if name_node else ""
+                    name = sys.intern(name_node.text.decode("utf-8")) if name_node else ""
                     metadata = self.extract_metadata(entity_node)
                     start_byte = entity_node.start_byte
                     end_byte = entity_node.end_byte
-                    content = self.code[start_byte:end_byte]
+                    content = self.code_bytes[start_byte:end_byte].decode('utf-8')
                     entities.append(CodeEntity(
                         name=name,
                         type=pattern,
@@ -185,26 +191,32 @@ class JavaParser(BaseLanguageParser):
             if node.type == 'constructor_declaration':
                 metadata['is_constructor'] = True
             
+            # Index the children by type once instead of rescanning them for every field
+            children = node.children
+            first_child = {}
+            for child in children:
+                first_child.setdefault(child.type, child)
+            
             # Extract modifiers
-            modifiers_node = next((child for child in node.children if child.type == 'modifiers'), None)
+            modifiers_node = first_child.get('modifiers')
             if modifiers_node:
                 for modifier in modifiers_node.children:
                     mod_text = modifier.text.decode('utf-8')
                     metadata['modifiers'].append(mod_text)
-                    if mod_text in ['public', 'private', 'protected', 'static', 'final', 
+                    if mod_text in {'public', 'private', 'protected', 'static', 'final', 
                                   'abstract', 'synchronized', 'volatile', 'transient', 
-                                  'native', 'strictfp']:
+                                  'native', 'strictfp'}:
                         metadata[f'is_{mod_text}'] = True
             
             # Extract return type for methods
             if node.type == 'method_declaration':
-                return_type_node = next((child for child in node.children 
-                                      if child.type in ['type_identifier', 'void_type']), None)
+                return_type_node = next((child for child in children 
+                                      if child.type in {'type_identifier', 'void_type'}), None)
                 if return_type_node:
                     metadata['return_type'] = return_type_node.text.decode('utf-8')
             
             # Extract throws clause
-            throws_node = next((child for child in node.children if child.type == 'throws'), None)
+            throws_node = first_child.get('throws')
             if throws_node:
                 metadata['throws'] = [
                     child.text.decode('utf-8')
@@ -213,7 +225,7 @@ class JavaParser(BaseLanguageParser):
                 ]
             
             # Extract parameters
-            parameters_node = next((child for child in node.children if child.type == 'formal_parameters'), None)
+            parameters_node = first_child.get('formal_parameters')
             if parameters_node:
                 for param in parameters_node.children:
                     if param.type == 'formal_parameter':
@@ -224,7 +236,7 @@ class JavaParser(BaseLanguageParser):
                             metadata['parameters'].append(param_name)
             
             # Extract type parameters
-            type_parameters_node = next((child for child in node.children if child.type == 'type_parameters'), None)
+            type_parameters_node = first_child.get('type_parameters')
             if type_parameters_node:
                 metadata['type_parameters'] = [
                     child.text.decode('utf-8')
@@ -234,11 +246,11 @@ class JavaParser(BaseLanguageParser):
             
             # Extract superclass and interfaces for classes
             if node.type == 'class_declaration':
-                superclass_node = next((child for child in node.children if child.type == 'superclass'), None)
+                superclass_node = first_child.get('superclass')
                 if superclass_node:
                     metadata['super_class'] = superclass_node.children[0].text.decode('utf-8')
                 
-                interfaces_node = next((child for child in node.children if child.type == 'super_interfaces'), None)
+                interfaces_node = first_child.get('super_interfaces')
                 if interfaces_node:
                     metadata['interfaces'] = [
                         child.text.decode('utf-8')
@@ -247,12 +259,12 @@ class JavaParser(BaseLanguageParser):
                     ]
             
             # Extract annotations
-            for child in node.children:
-                if child.type in ['annotation', 'marker_annotation', 'single_element_annotation']:
+            for child in children:
+                if child.type in {'annotation', 'marker_annotation', 'single_element_annotation'}:
                     metadata['annotations'].append(child.text.decode('utf-8'))
             
             # Extract Javadoc if present
-            javadoc = next((child for child in node.children if child.type == 'javadoc_comment'), None)
+            javadoc = first_child.get('javadoc_comment')
             if javadoc:
                 metadata['javadoc'] = javadoc.text.decode('utf-8')
             
@@ -1,4 +1,5 @@
-from typing import Any, Dict, List
+import sys
+from typing import Any, Dict, List, Optional
 from ..base_types import BaseLanguageParser, CodeEntity, CodeLocation, StringLiteral
 # Import direct logging functions
 from config.logging_config import info, error, warning, debug
@@ -11,12 +12,17 @@ class JavaScriptParser(BaseLanguageParser):
         """Parse code content using tree-sitter"""
         return self.parser.parse(content)
 
-    def parse_file(self, file_path: str) -> List[CodeEntity]:
+    def parse_file(self, file_path: str, content: Optional[str] = None, content_bytes: Optional[bytes] = None) -> List[CodeEntity]:
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-            self.code = content 
-            tree = self.parse(bytes(content, 'utf-8'))
+            # tree-sitter works on bytes, so only encode when the caller did not already read them
+            if content_bytes is None:
+                if content is None:
+                    with open(file_path, 'rb') as file:
+                        content_bytes = file.read()
+                else:
+                    content_bytes = content.encode('utf-8')
+            self.code_bytes = content_bytes
+            tree = self.parse(self.code_bytes)
             entities = self.extract_entities(tree.root_node)
             return entities
         except Exception as e:
@@ -32,11 +38,11 @@ class JavaScriptParser(BaseLanguageParser):
             for entity_node in node.children:
                 if entity_node.type in node_types:
                     name_node = self.get_child_by_field_name(entity_node, "name")
-                    name = name_node.text.decode("utf-8") if name_node else ""
+                    name = sys.intern(name_node.text.decode("utf-8")) if name_node else ""
                     metadata = self.extract_metadata(entity_node)
                     start_byte = entity_node.start_byte
                     end_byte = entity_node.end_byte
-                    content = self.code[start_byte:end_byte]
+                    content = self.code_bytes[start_byte:end_byte].decode('utf-8')
                     entities.append(CodeEntity(
                         name=name,
                         type=pattern,
@@ -174,24 +180,28 @@ class JavaScriptParser(BaseLanguageParser):
         }
         
         try:
+            # Collect the child types once instead of rescanning the children for every flag
+            children = node.children
+            child_types = {child.type for child in children}
+            
             # Check node type specifics
             metadata.update({
-                'is_async': 'async' in node.type or any(child.type == 'async' for child in node.children),
-                'is_generator': 'generator' in node.type or any(child.type == '*' for child in node.children),
+                'is_async': 'async' in node.type or 'async' in child_types,
+                'is_generator': 'generator' in node.type or '*' in child_types,
                 'is_arrow': node.type == 'arrow_function',
-                'is_getter': node.type == 'getter' or any(child.type == 'get' for child in node.children),
-                'is_setter': node.type == 'setter' or any(child.type == 'set' for child in node.children),
+                'is_getter': node.type == 'getter' or 'get' in child_types,
+                'is_setter': node.type == 'setter' or 'set' in child_types,
                 'is_constructor': node.type == 'method_definition' and any(
-                    child.type == 'property_identifier' and child.text.decode('utf-8') == 'constructor'
-                    for child in node.children
+                    child.type == 'property_identifier' and child.text == b'constructor'
+                    for child in children
                 ),
-                'is_static': any(child.type == 'static' for child in node.children),
-                'computed': any(child.type == 'computed_property_name' for child in node.children)
+                'is_static': 'static' in child_types,
+                'computed': 'computed_property_name' in child_types
             })
             
             # Variable declaration type
             if node.type == 'variable_declaration':
-                kind = next((child.type for child in node.children if child.type in ['const', 'let', 'var']), None)
+                kind = next((child.type for child in children if child.type in {'const', 'let', 'var'}), None)
                 if kind:
                     metadata[f'is_{kind}'] = True
             
@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Tuple
+import sys
+from typing import Any, Dict, List, Optional, Tuple
 from ..base_types import BaseLanguageParser, CodeEntity, CodeLocation, StringLiteral
 from tree_sitter import Node
 # Import direct logging functions
@@ -13,12 +14,17 @@ class PythonParser(BaseLanguageParser):
         """Parse code content using tree-sitter"""
         return self.parser.parse(content)
 
-    def parse_file(self, file_path: str) -> List[CodeEntity]:
+    def parse_file(self, file_path: str, content: Optional[str] = None, content_bytes: Optional[bytes] = None) -> List[CodeEntity]:
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-            self.code = content 
-            tree = self.parser.parse(bytes(content, 'utf-8'))
+            # tree-sitter works on bytes, so only encode when the caller did not already read them
+            if content_bytes is None:
+                if content is None:
+                    with open(file_path, 'rb') as file:
+                        content_bytes = file.read()
+                else:
+                    content_bytes = content.encode('utf-8')
+            self.code_bytes = content_bytes
+            tree = self.parser.parse(self.code_bytes)
             entities = self.extract_entities(tree.root_node)
             return entities
         except Exception as e:
@@ -28,30 +34,49 @@ class PythonParser(BaseLanguageParser):
 
     def extract_entities(self, node: Any) -> List[CodeEntity]:
         entities = []
-        for pattern, node_types in self.get_entity_patterns().items():
-            if not isinstance(node_types, list):
-                node_types = [node_types]
-            for entity_node in node.children:
-                if entity_node.type in node_types:
-                    name_node = self.get_child_by_field_name(entity_node, "name")
-                    name = name_node.text.decode("utf-8") if name_node else ""
-                    metadata = self.extract_metadata(entity_node)
-                    start_byte = entity_node.start_byte
-                    end_byte = entity_node.end_byte
-                    content = self.code[start_byte:end_byte]
-                    entities.append(CodeEntity(
-                        name=name,
-                        type=pattern,
-                        content=content,
-                        metadata=metadata,
-                        location=self.create_code_location(entity_node),
-                        language=self.get_language_name()
-                    ))
-                    
-                    # Recursively process children for nested entities
-                    entities.extend(self.extract_entities(entity_node))
+        patterns_by_type = self._get_patterns_by_type()
+        for entity_node in node.children:
+            patterns = patterns_by_type.get(entity_node.type)
+            if not patterns:
+                continue
+            name_node = self.get_child_by_field_name(entity_node, "name")
+            name = sys.intern(name_node.text.decode("utf-8")) if name_node else ""
+            metadata = self.extract_metadata(entity_node)
+            content = self.code_bytes[entity_node.start_byte:entity_node.end_byte].decode('utf-8')
+            for pattern in patterns:
+                entities.append(CodeEntity(
+                    name=name,
+                    type=pattern,
+                    content=content,
+                    metadata=dict(metadata),
+                    location=self.create_code_location(entity_node),
+                    language=self.get_language_name()
+                ))
+            
+            # Descend into each captured node once, however many patterns matched it
+            entities.extend(self.extract_entities(entity_node))
         return entities
 
+    def _get_patterns_by_type(self) -> Dict[str, List[str]]:
+        """Map each tree-sitter node type to the entity patterns that capture it"""
+        patterns_by_type = getattr(self, '_patterns_by_type', None)
+        if patterns_by_type is None:
+            patterns_by_type = {}
+            for pattern, node_types in self.get_entity_patterns().items():
+                if not isinstance(node_types, list):
+                    node_types = [node_types]
+                for node_type in node_types:
+                    patterns_by_type.setdefault(node_type, []).append(pattern)
+            self._patterns_by_type = patterns_by_type
+        return patterns_by_type
+
+    def _get_yield_query(self):
+        """Query matching yield expressions anywhere below a node"""
+        yield_query = getattr(self, '_yield_query', None)
+        if yield_query is None:
+            yield_query = self._yield_query = self.language.query('(yield) @yield')
+        return yield_query
+
     def get_entity_patterns(self) -> Dict[str, Any]:
         return {
             # Function-related patterns
@@ -180,6 +205,7 @@ class PythonParser(BaseLanguageParser):
             # Documentation
             'docstring': None,
             'decorators': [],
+            'is_api': False,
             
             # Function/Method specifics
             'parameters': [],
@@ -202,18 +228,21 @@ class PythonParser(BaseLanguageParser):
             metadata.update({
                 'is_async': 'async' in node.type,
                 'is_lambda': node.type == 'lambda',
-                'is_generator': any(child.type == 'yield_expression' for child in node.children),
+                'is_generator': node.type == 'function_definition' and bool(self._get_yield_query().captures(node)),
             })
             
             # Process decorators
             decorators = []
             for child in node.children:
                 if child.type == 'decorator':
-                    decorator_text = self.code[child.start_byte:child.end_byte].strip('@')
+                    decorator_bytes = self.code_bytes[child.start_byte:child.end_byte]
+                    if b'@app.' in decorator_bytes or b'@router.' in decorator_bytes:
+                        metadata['is_api'] = True
+                    decorator_text = decorator_bytes.decode('utf-8').strip('@')
                     decorators.append(decorator_text)
                     
                     # Check for special decorators
-                    if decorator_text in ['classmethod', 'staticmethod', 'property', 'abstractmethod']:
+                    if decorator_text in {'classmethod', 'staticmethod', 'property', 'abstractmethod'}:
                         metadata[f'is_{decorator_text}'] = True
                     elif decorator_text == 'dataclass':
                         metadata['is_dataclass'] = True
@@ -222,9 +251,10 @@ class PythonParser(BaseLanguageParser):
                         
             metadata['decorators'] = decorators
             
-            # Extract parameters for functions/methods
-            if node.type in ['function_definition', 'async_function_definition']:
-                parameters = self.get_child_by_field_name(node, "parameters")
+            # Kind-specific fields, looked up only on the node kinds whose grammar defines them
+            node_type = node.type
+            if node_type == 'function_definition':
+                parameters = node.child_by_field_name("parameters")
                 if parameters:
                     metadata['parameters'] = [
                         param.text.decode('utf-8')
@@ -233,23 +263,17 @@ class PythonParser(BaseLanguageParser):
                     ]
                     
                     # Check if it's a method by looking for 'self' or 'cls'
-                    if metadata['parameters'] and metadata['parameters'][0] in ['self', 'cls']:
+                    if metadata['parameters'] and metadata['parameters'][0] in {'self', 'cls'}:
                         metadata['is_method'] = True
+                
+                # Extract return annotation
+                return_annotation = node.child_by_field_name("return_type")
+                if return_annotation:
+                    metadata['return_annotation'] = return_annotation.text.decode('utf-8')
             
-            # Extract type annotations
-            type_annotation = self.get_child_by_field_name(node, "annotation")
-            if type_annotation:
-                metadata['is_type_annotated'] = True
-                metadata['type_annotation'] = type_annotation.text.decode('utf-8')
-            
-            # Extract return annotation
-            return_annotation = self.get_child_by_field_name(node, "return_annotation")
-            if return_annotation:
-                metadata['return_annotation'] = return_annotation.text.decode('utf-8')
-            
-            # Extract class bases
-            if node.type == 'class_definition':
-                bases = self.get_child_by_field_name(node, "bases")
+            elif node_type == 'class_definition':
+                # Extract class bases
+                bases = node.child_by_field_name("superclasses")
                 if bases:
                     metadata['bases'] = [
                         base.text.decode('utf-8')
@@ -257,6 +281,13 @@ class PythonParser(BaseLanguageParser):
                         if base.type == "identifier"
                     ]
             
+            elif node_type == 'assignment':
+                # Extract type annotations
+                type_annotation = node.child_by_field_name("type")
+                if type_annotation:
+                    metadata['is_type_annotated'] = True
+                    metadata['type_annotation'] = type_annotation.text.decode('utf-8')
+            
             # Check for docstring
             for child in node.children:
                 if child.type == 'expression_statement':
@@ -267,12 +298,12 @@ class PythonParser(BaseLanguageParser):
             
             # Check for nested definition
             parent = node.parent
-            if parent and parent.type in ['class_definition', 'function_definition']:
+            if parent and parent.type in {'class_definition', 'function_definition'}:
                 metadata['is_nested'] = True
                 metadata['parent_type'] = parent.type
             
             # Import specific metadata
-            if node.type in ['import_from_statement', 'import_statement']:
+            if node.type in {'import_from_statement', 'import_statement'}:
                 metadata['is_relative_import'] = any(child.type == 'relative_import' for child in node.children)
                 if metadata['is_relative_import']:
                     metadata['import_level'] = len([c for c in node.children if c.type == '.'])
@@ -285,20 +316,16 @@ class PythonParser(BaseLanguageParser):
             return metadata
 
     def get_child_by_field_name(self, node: Any, field_name: str) -> Any:
-        try:
-            # Try direct field access first
-            result = node.child_by_field_name(field_name)
-            if result:
-                return result
-            
-            # Fallback to type matching
-            for child in node.children:
-                if child.type == field_name:
-                    return child
-            return None
-            
-        except Exception:
-            return None
+        # Try direct field access first
+        result = node.child_by_field_name(field_name)
+        if result:
+            return result
+        
+        # Fallback to type matching
+        for child in node.children:
+            if child.type == field_name:
+                return child
+        return None
 
     def create_code_location(self, node: Any) -> CodeLocation:
         start_line, start_col = node.start_point
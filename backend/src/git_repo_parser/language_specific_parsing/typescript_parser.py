@@ -1,4 +1,5 @@
-from typing import Any, Dict, List
+import sys
+from typing import Any, Dict, List, Optional
 from ..base_types import BaseLanguageParser, CodeEntity, CodeLocation
 # Import direct logging functions
 from config.logging_config import info, error, warning, debug
@@ -92,12 +93,17 @@ class TypeScriptParser(BaseLanguageParser):
             ]
         }
 
-    def parse_file(self, file_path: str) -> List[CodeEntity]:
+    def parse_file(self, file_path: str, content: Optional[str] = None, content_bytes: Optional[bytes] = None) -> List[CodeEntity]:
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-            self.code = content 
-            tree = self.parse(bytes(content, 'utf-8'))
+            # tree-sitter works on bytes, so only encode when the caller did not already read them
+            if content_bytes is None:
+                if content is None:
+                    with open(file_path, 'rb') as file:
+                        content_bytes = file.read()
+                else:
+                    content_bytes = content.encode('utf-8')
+            self.code_bytes = content_bytes
+            tree = self.parse(self.code_bytes)
             entities = []
             if tree and tree.root_node:
                 entities = self.extract_entities(tree.root_node)
@@ -116,10 +122,10 @@ class TypeScriptParser(BaseLanguageParser):
                 node_types = [node_types]
                 
             if node.type in node_types:
-                name = self._extract_name(node)
+                name = sys.intern(self._extract_name(node))
                 if name:
                     metadata = self.extract_metadata(node)
-                    content = self.code[node.start_byte:node.end_byte]
+                    content = self.code_bytes[node.start_byte:node.end_byte].decode('utf-8')
                     entities.append(CodeEntity(
                         name=name,
                         type=pattern,
@@ -141,7 +147,7 @@ class TypeScriptParser(BaseLanguageParser):
             # For export default declaration, look for the class/function name
             if node.type == 'export_default_declaration':
                 for child in node.children:
-                    if child.type in ['class_declaration', 'function_declaration']:
+                    if child.type in {'class_declaration', 'function_declaration'}:
                         name_node = self.get_child_by_field_name(child, "name")
                         if name_node:
                             return name_node.text.decode('utf-8')
@@ -152,14 +158,14 @@ class TypeScriptParser(BaseLanguageParser):
                 return name_node.text.decode('utf-8')
             
             # Property and method identifiers
-            if node.type in ['property_definition', 'public_field_definition', 'private_field_definition', 
-                           'method_definition', 'property_identifier']:
+            if node.type in {'property_definition', 'public_field_definition', 'private_field_definition', 
+                           'method_definition', 'property_identifier'}:
                 for child in node.children:
-                    if child.type in ['property_identifier', 'identifier']:
+                    if child.type in {'property_identifier', 'identifier'}:
                         return child.text.decode('utf-8')
             
             # Variable declarations
-            if node.type in ['variable_declaration', 'const_declaration', 'let_declaration']:
+            if node.type in {'variable_declaration', 'const_declaration', 'let_declaration'}:
                 declarator = self.get_child_by_field_name(node, "declarator")
                 if declarator:
                     name_node = self.get_child_by_field_name(declarator, "name")
@@ -208,8 +214,8 @@ class TypeScriptParser(BaseLanguageParser):
             # Process children for modifiers and info
             for child in node.children:
                 if child.type == 'decorator':
-                    metadata['decorators'].append(self.code[child.start_byte:child.end_byte])
-                elif child.type in ['public', 'private', 'protected', 'static', 'readonly', 'abstract', 'async']:
+                    metadata['decorators'].append(self.code_bytes[child.start_byte:child.end_byte].decode('utf-8'))
+                elif child.type in {'public', 'private', 'protected', 'static', 'readonly', 'abstract', 'async'}:
                     metadata['modifiers'].append(child.type)
                     if child.type == 'private':
                         metadata['is_private'] = True
@@ -249,18 +255,14 @@ class TypeScriptParser(BaseLanguageParser):
 
     def get_child_by_field_name(self, node: Any, field_name: str) -> Any:
         """Get child node by field name"""
-        try:
-            result = node.child_by_field_name(field_name)
-            if result:
-                return result
-            
-            for child in node.children:
-                if child.type == field_name:
-                    return child
-            return None
-            
-        except Exception:
-            return None
+        result = node.child_by_field_name(field_name)
+        if result:
+            return result
+        
+        for child in node.children:
+            if child.type == field_name:
+                return child
+        return None
 
     def create_code_location(self, node: Any) -> CodeLocation:
         """Create location information for the node"""
@@ -1,7 +1,7 @@
 from pathlib import Path
 import os
 from collections import defaultdict
-from typing import Dict, Set, Tuple
+from typing import Dict, Tuple
 from transformers import pipeline
 # Replace standard logging with our custom logging
 from config.logging_config import info, error, warning, debug
@@ -15,29 +15,34 @@ class StatsParser:
                                     '.rb': 'Ruby','.php': 'PHP','.ts': 'TypeScript','.swift': 'Swift',
                                     '.kt': 'Kotlin','.txt':'Text File'}
         self.repo_path = Path(repo_path)
-        self.excluded_dirs = {'.git', 'node_modules', 'venv', '__pycache__', 'build', 'dist'}
+        self.excluded_dirs = {'.git', 'node_modules', 'venv', '.venv', '__pycache__', 'build', 'dist', '.tox'}
         # Remove the logger initialization
         self.code_files = self._scan_repository()
         
-    def _scan_repository(self) -> Set[Path]:
-        code_files = set()
-        for root, dirs, files in os.walk(self.repo_path):
-            dirs[:] = [d for d in dirs if d not in self.excluded_dirs]
-            for file in files:
-                file_path = Path(root) / file
-                ext = file_path.suffix.lower()
-                if ext in self.LANGUAGE_EXTENSIONS:
-                    code_files.add(file_path)   
+    def _scan_repository(self) -> Dict[str, Tuple[str, int]]:
+        """Map each code file to its language and size with a single pruned scandir walk"""
+        code_files = {}
+        stack = [str(self.repo_path)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.excluded_dirs:
+                                stack.append(entry.path)
+                            continue
+                        language = self.LANGUAGE_EXTENSIONS.get(os.path.splitext(entry.name)[1].lower())
+                        if language and entry.is_file():
+                            code_files[entry.path] = (language, entry.stat().st_size)
+            except OSError as e:
+                warning(f"Cannot scan directory: {e}")
         return code_files
     
     async def get_stats(self) -> Dict:
         language_stats = defaultdict(int)
         total_size = 0
         # Process code files
-        for file_path in self.code_files:
-            ext = file_path.suffix.lower()
-            size = os.path.getsize(file_path)
-            language = self.LANGUAGE_EXTENSIONS[ext]
+        for language, size in self.code_files.values():
             language_stats[language] += size
             total_size += size
                 
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Backend modules import each other from the src root (e.g. `from chunking...`)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("tree_sitter")
+
+from chunking.language_specific_chunk.python_chunker import PythonChunker
+from git_repo_parser.base_types import CodeEntity, CodeLocation
+
+API_SOURCE = '''@app.get("/items")
+def read_items():
+    return []
+'''
+
+
+def _chunker():
+    # Dependency enrichment is best effort, so a parser without trees is enough here
+    language = SimpleNamespace(query=lambda source: None)
+    return PythonChunker(SimpleNamespace(language=language, parse=lambda code_bytes: None))
+
+
+def test_api_decorated_function_yields_one_api_chunk():
+    entity = CodeEntity(
+        name="read_items",
+        type="decorator",
+        content=API_SOURCE.rstrip("\n"),
+        location=CodeLocation(start_line=0, start_col=0, end_line=2, end_col=13),
+        language="python",
+        metadata={"is_api": True, "decorators": ['app.get("/items")']},
+    )
+
+    chunks = _chunker().create_chunks_from_entities([entity], "app/routes.py", API_SOURCE)
+
+    api_chunks = [chunk for chunk in chunks if chunk.type == "api"]
+    assert len(api_chunks) == 1
+    assert api_chunks[0].metadata["path"] == "/items"
+    assert len({chunk.chunk_id for chunk in chunks}) == len(chunks)
+
+
+def test_bad_entity_only_loses_its_own_chunk():
+    good = CodeEntity(
+        name="helper",
+        type="function",
+        content="def helper():\n    return 1",
+        location=CodeLocation(start_line=0, start_col=0, end_line=1, end_col=12),
+        language="python",
+    )
+    # No location breaks both grouping and chunk creation for this entity
+    bad = CodeEntity(
+        name="broken",
+        type="function",
+        content="def broken():\n    return 2",
+        location=None,
+        language="python",
+    )
+
+    chunks = _chunker().create_chunks_from_entities([good, bad], "app/util.py", "")
+
+    assert [chunk.metadata["declarations"] for chunk in chunks] == [["helper"]]
@@ -11,32 +11,70 @@ import time
 from tqdm import tqdm 
 import uuid
 import tiktoken
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from array import array
+import hashlib
+import threading
 
 
 logger = logging.getLogger(__name__)
 
+# Embeddings of recently stored texts, keyed by content digest, so re-ingesting unchanged code skips the API
+EMBEDDING_CACHE_SIZE = 8192
+_embedding_cache = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+def _content_digest(text: str) -> bytes:
+    """Stable digest of a text, unlike hash() which is salted per process"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+@lru_cache(maxsize=None)
+def get_qdrant_client(url: str = QDRANT_HOST, api_key: Optional[str] = QDRANT_API_KEY) -> QdrantClient:
+    """Return a shared QdrantClient so connections are reused across handlers"""
+    info(f"Creating shared Qdrant client for {url}")
+    return QdrantClient(url=url, api_key=api_key)
+
 class ChunkStoreHandler:
     """Handles storage of chunks in the vector database."""
     
     def __init__(self, repo_path, user_id: Optional[str] = None, session_id: Optional[str] = None):
         info(f"Initializing ChunkStoreHandler for repo: {repo_path}, user: {user_id}, session: {session_id}")
-        self.client = QdrantClient(
-            url=QDRANT_HOST,
-            api_key=QDRANT_API_KEY
-        )
+        self.client = get_qdrant_client()
         self.user_id = user_id.replace('@', '_').replace('.', '_') 
         self.session_id = session_id
-        self.openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        self._openai_client = None  # Created on first embedding request
         self.repo_path = repo_path
-        self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        self._tokenizer = None  # Loaded on first token count
+        self._lazy_lock = threading.Lock()  # Guards lazy init from the embedding pool
         self.MAX_TOKENS = 8192
         self.MAX_RETRIES = 3  # Added retry limit
         self.BATCH_SIZE = 500
+        self.EMBEDDING_WORKERS = 4  # Embedding requests in flight at once
         self.collection_name = self._create_collection_name()
         self.processed_chunks = set()  # Track processed chunks
         self._ensure_collection_exists()
         info(f"ChunkStoreHandler initialized with collection: {self.collection_name}")
         
+    @property
+    def openai_client(self) -> OpenAI:
+        """OpenAI client, created only once embeddings are actually needed"""
+        if self._openai_client is None:
+            with self._lazy_lock:
+                if self._openai_client is None:
+                    self._openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        return self._openai_client
+
+    @property
+    def tokenizer(self) -> tiktoken.Encoding:
+        """Tokenizer, loaded only once texts are actually batched"""
+        if self._tokenizer is None:
+            with self._lazy_lock:
+                if self._tokenizer is None:
+                    self._tokenizer = tiktoken.get_encoding("cl100k_base")
+        return self._tokenizer
+        
     def _create_collection_name(self):
         """
         Generate a unique collection name for QDrant from a git repository URL.
@@ -81,12 +119,17 @@ class ChunkStoreHandler:
     def _split_text(self, text: str) -> List[str]:
         """Splits long texts into smaller chunks within token limits."""
         tokens = self.tokenizer.encode(text, disallowed_special=())
+        return [chunk for chunk, _ in self._split_tokens(tokens)]
+
+    def _split_tokens(self, tokens: List[int]) -> List[tuple]:
+        """Splits already encoded tokens into (text, token_count) pieces within token limits."""
         chunks = []
         
         for i in range(0, len(tokens), self.MAX_TOKENS):
-            chunk = self.tokenizer.decode(tokens[i : i + self.MAX_TOKENS])
+            piece = tokens[i : i + self.MAX_TOKENS]
+            chunk = self.tokenizer.decode(piece)
             if chunk.strip():  # Only add non-empty chunks
-                chunks.append(chunk)
+                chunks.append((chunk, len(piece)))
         
         return chunks
     
@@ -100,26 +143,27 @@ class ChunkStoreHandler:
 
         for text in texts:
             # Skip if already processed
-            text_hash = hash(text)
+            text_hash = _content_digest(text)
             if text_hash in self.processed_chunks:
                 skipped_count += 1
                 continue
                 
-            token_count = self._count_tokens(text)
+            # Encode once; the tokens are reused if the text has to be split
+            tokens = self.tokenizer.encode(text, disallowed_special=())
+            token_count = len(tokens)
 
             if token_count > self.MAX_TOKENS:
-                chunks = self._split_text(text)
                 # Process split chunks immediately
-                for chunk in chunks:
-                    chunk_hash = hash(chunk)
+                for chunk, chunk_tokens in self._split_tokens(tokens):
+                    chunk_hash = _content_digest(chunk)
                     if chunk_hash not in self.processed_chunks:
-                        if current_tokens + self._count_tokens(chunk) > self.MAX_TOKENS:
+                        if current_tokens + chunk_tokens > self.MAX_TOKENS:
                             if current_batch:
                                 batches.append(current_batch)
                             current_batch = []
                             current_tokens = 0
                         current_batch.append(chunk)
-                        current_tokens += self._count_tokens(chunk)
+                        current_tokens += chunk_tokens
                         self.processed_chunks.add(chunk_hash)
                 continue
 
@@ -147,27 +191,82 @@ class ChunkStoreHandler:
         all_embeddings = []
         batches = self._prepare_batches(texts, batch_size)
 
-        for batch_idx, batch in enumerate(tqdm(batches, desc="Generating embeddings")):
-            for attempt in range(self.MAX_RETRIES):
-                try:
-                    if attempt > 0:
-                        time.sleep(attempt * 2)  # Exponential backoff
-                    response = self.openai_client.embeddings.create(
-                        model="text-embedding-ada-002",
-                        input=batch
-                    )
-                    batch_embeddings = [item.embedding for item in response.data]
-                    all_embeddings.extend(batch_embeddings)
-                    break
-                except Exception as e:
-                    if attempt == self.MAX_RETRIES - 1:
-                        error(f"Failed to generate embeddings after {self.MAX_RETRIES} attempts: {str(e)}")
-                        raise
-                    warning(f"Embedding attempt {attempt + 1} failed: {str(e)}")
+        # Batches are independent network calls, so keep several in flight; map() preserves order
+        with ThreadPoolExecutor(max_workers=self.EMBEDDING_WORKERS) as executor:
+            results = executor.map(self._embed_batch, batches)
+            for batch_embeddings in tqdm(results, total=len(batches), desc="Generating embeddings"):
+                all_embeddings.extend(batch_embeddings)
 
         info(f"Successfully generated {len(all_embeddings)} embeddings")
         return all_embeddings
 
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        """Embed one batch of texts, reusing cached embeddings for texts seen before."""
+        keys = [_content_digest(text) for text in batch]
+        with _embedding_cache_lock:
+            cached = [_embedding_cache.get(key) for key in keys]
+            for key, vector in zip(keys, cached):
+                if vector is not None:
+                    _embedding_cache.move_to_end(key)
+        
+        missing = [text for text, vector in zip(batch, cached) if vector is None]
+        fresh = iter(self._request_embeddings(missing) if missing else ())
+        
+        embeddings = []
+        with _embedding_cache_lock:
+            for key, vector in zip(keys, cached):
+                if vector is None:
+                    embedding = next(fresh)
+                    # Compact float32 storage keeps the cache small
+                    _embedding_cache[key] = array('f', embedding)
+                    embeddings.append(embedding)
+                else:
+                    embeddings.append(vector.tolist())
+            while len(_embedding_cache) > EMBEDDING_CACHE_SIZE:
+                _embedding_cache.popitem(last=False)
+        return embeddings
+
+    def _request_embeddings(self, batch: List[str]) -> List[List[float]]:
+        """Request embeddings for one batch of texts, retrying with backoff on failure."""
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                if attempt > 0:
+                    time.sleep(attempt * 2)  # Exponential backoff
+                response = self.openai_client.embeddings.create(
+                    model="text-embedding-ada-002",
+                    input=batch
+                )
+                return [item.embedding for item in response.data]
+            except Exception as e:
+                if attempt == self.MAX_RETRIES - 1:
+                    error(f"Failed to generate embeddings after {self.MAX_RETRIES} attempts: {str(e)}")
+                    raise
+                warning(f"Embedding attempt {attempt + 1} failed: {str(e)}")
+
+    def _format_chunks(self, file_path: str, chunks, contents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Append the contents and payload metadata of one file's chunks in a single pass"""
+        append_content = contents.append
+        append_metadata = metadatas.append
+        for chunk in chunks:
+            # Validate chunk has required attributes
+            content = getattr(chunk, 'content', None)
+            if content is None:
+                warning(f"Chunk missing content in {file_path}")
+                continue
+
+            append_content(content)
+            append_metadata({
+                'file_path': getattr(chunk, 'file_path', file_path),
+                'language': getattr(chunk, 'language', 'unknown'),
+                'type': getattr(chunk, 'type', 'unknown'),
+                'start_line': getattr(chunk, 'start_line', 0),
+                'end_line': getattr(chunk, 'end_line', 0),
+                'metadata': getattr(chunk, 'metadata', {}),
+                'dependencies': getattr(chunk, 'dependencies', []),
+                'imports': getattr(chunk, 'imports', []),
+                'chunk_hash': _content_digest(content).hex()  # For duplicate detection
+            })
+
     def store_chunks(self, file_chunks) -> bool:
         """
         Store code chunks and summary in the vector database in batches.
@@ -190,49 +289,33 @@ class ChunkStoreHandler:
                     error(f"Invalid file data structure for {file_path}")
                     continue
                 
-                for chunk in file_data['chunks']:
-                    # Validate chunk has required attributes
-                    if not hasattr(chunk, 'content'):
-                        warning(f"Chunk missing content in {file_path}")
-                        continue
-
-                    docs_contents.append(chunk.content)
-                    metadata = {
-                        'file_path': getattr(chunk, 'file_path', file_path),
-                        'language': getattr(chunk, 'language', 'unknown'),
-                        'type': getattr(chunk, 'type', 'unknown'),
-                        'start_line': getattr(chunk, 'start_line', 0),
-                        'end_line': getattr(chunk, 'end_line', 0),
-                        'metadata': getattr(chunk, 'metadata', {}),
-                        'dependencies': getattr(chunk, 'dependencies', []),
-                        'imports': getattr(chunk, 'imports', []),
-                        'chunk_hash': hash(chunk.content)  # For duplicate detection
-                    }
-                    docs_metadatas.append(metadata)
+                self._format_chunks(file_path, file_data['chunks'], docs_contents, docs_metadatas)
                     
             if docs_contents and docs_metadatas:
                 info(f"Generating embeddings for {len(docs_contents)} chunks")
                 embeddings = self._get_embeddings(docs_contents)
                 
-                points = []
-                for content, metadata, embedding in zip(docs_contents, docs_metadatas, embeddings):
-                    point_id = str(uuid.uuid4())
-                    point = models.PointStruct(
-                        id=point_id,
-                        vector=embedding,
-                        payload={
-                            'content': content,
-                            'metadata': metadata
-                        }
-                    )
-                    points.append(point)
-                
-                # Store in Qdrant in batches with retry logic
-                info(f"Storing {len(points)} points in Qdrant")
-                total_batches = (len(points) + self.BATCH_SIZE - 1) // self.BATCH_SIZE
+                # Store in Qdrant in batches with retry logic, building only the current batch's points
+                num_points = min(len(docs_contents), len(embeddings))
+                info(f"Storing {num_points} points in Qdrant")
+                total_batches = (num_points + self.BATCH_SIZE - 1) // self.BATCH_SIZE
                 
-                for i in range(0, len(points), self.BATCH_SIZE):
-                    batch = points[i:i + self.BATCH_SIZE]
+                for i in range(0, num_points, self.BATCH_SIZE):
+                    batch = [
+                        models.PointStruct(
+                            id=str(uuid.uuid4()),
+                            vector=embedding,
+                            payload={
+                                'content': content,
+                                'metadata': metadata
+                            }
+                        )
+                        for content, metadata, embedding in zip(
+                            docs_contents[i:i + self.BATCH_SIZE],
+                            docs_metadatas[i:i + self.BATCH_SIZE],
+                            embeddings[i:i + self.BATCH_SIZE]
+                        )
+                    ]
                     batch_num = i // self.BATCH_SIZE + 1
                     
                     for attempt in range(self.MAX_RETRIES):
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from decimal import Decimal
 import json
@@ -5,7 +6,7 @@ import aioboto3
 from botocore.exceptions import ClientError
 from typing import Dict, Any, Optional
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from config.config import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_DEFAULT_REGION, USE_LOCAL_DYNAMODB, DYNAMODB_LOCAL_ENDPOINT
 from config.logging_config import info, warning, debug, error
 
@@ -283,28 +284,12 @@ class DynamoDBManager:
 
             sessions = sessions_response.get('Items', [])
 
-            today_message_count = 0
-
-            # Check messages in each session
-            for session in sessions:
-                session_id = session['SK'].split('#')[1]
-
-                # Query messages created today
-                messages_response = await table.query(
-                    KeyConditionExpression='PK = :pk AND begins_with(SK, :sk)',
-                    FilterExpression='updated_at >= :today',
-                    ExpressionAttributeValues={
-                        ':pk': f'USER#{user_id}#SESSION#{session_id}',
-                        ':sk': 'MESSAGE#',
-                        ':today': today_start  # Using formatted string timestamp for filtering
-                    }
-                )
-
-                # today_message_count += len(messages_response.get('Items', []))
-                if messages_response.get('Items'):
-                    for item in messages_response.get('Items'):
-                        if 'response' in item:  # Check if the item has a 'response' field
-                            today_message_count += 1
+            # Query every session concurrently and add up the per-session counts once they are all in
+            session_counts = await asyncio.gather(*(
+                self._count_today_responses(table, user_id, session['SK'].split('#')[1], today_start)
+                for session in sessions
+            ))
+            today_message_count = sum(session_counts)
 
             remaining = max(0, limit - today_message_count)
             info(f"User {user_id} has used {today_message_count}/{limit} messages today. Remaining: {remaining}")
@@ -327,6 +312,21 @@ class DynamoDBManager:
                 'limit_reached': True  # Fail safe: assume limit reached on error
             }
 
+    async def _count_today_responses(self, table, user_id: str, session_id: str, today_start: str) -> int:
+        """Count the answered messages of one session created since today_start"""
+        # Query messages created today
+        messages_response = await table.query(
+            KeyConditionExpression='PK = :pk AND begins_with(SK, :sk)',
+            FilterExpression='updated_at >= :today',
+            ExpressionAttributeValues={
+                ':pk': f'USER#{user_id}#SESSION#{session_id}',
+                ':sk': 'MESSAGE#',
+                ':today': today_start  # Using formatted string timestamp for filtering
+            }
+        )
+        # Only items with a 'response' field count towards the limit
+        return sum(1 for item in messages_response.get('Items', []) if 'response' in item)
+
     def _get_notification_message(self, remaining: int) -> Optional[str]:
         """
         Get the appropriate notification message based on remaining messages.
@@ -382,18 +382,19 @@ class DynamoDBManager:
 
         try:
             table = await self.get_table()
-            await table.put_item(Item=item)
-
-            # Update session timestamp
-            await table.update_item(
-                Key={
-                    'PK': f'USER#{user_id}',
-                    'SK': f'SESSION#{session_id}'
-                },
-                UpdateExpression='SET updated_at = :timestamp',
-                ExpressionAttributeValues={
-                    ':timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
+            # Append the message and update the session timestamp concurrently
+            await asyncio.gather(
+                table.put_item(Item=item),
+                table.update_item(
+                    Key={
+                        'PK': f'USER#{user_id}',
+                        'SK': f'SESSION#{session_id}'
+                    },
+                    UpdateExpression='SET updated_at = :timestamp',
+                    ExpressionAttributeValues={
+                        ':timestamp': item['updated_at']
+                    }
+                )
             )
 
             # Check limits after creating the message to get updated counts
@@ -436,18 +437,19 @@ class DynamoDBManager:
 
         try:
             table = await self.get_table()
-            await table.put_item(Item=item)
-
-            # Update session timestamp
-            await table.update_item(
-                Key={
-                    'PK': f'USER#{user_id}',
-                    'SK': f'SESSION#{session_id}'
-                },
-                UpdateExpression='SET updated_at = :timestamp',
-                ExpressionAttributeValues={
-                    ':timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
+            # Append the message and update the session timestamp concurrently
+            await asyncio.gather(
+                table.put_item(Item=item),
+                table.update_item(
+                    Key={
+                        'PK': f'USER#{user_id}',
+                        'SK': f'SESSION#{session_id}'
+                    },
+                    UpdateExpression='SET updated_at = :timestamp',
+                    ExpressionAttributeValues={
+                        ':timestamp': item['updated_at']
+                    }
+                )
             )
 
             # Check limits after creating the message to get updated counts
@@ -482,15 +484,13 @@ class DynamoDBManager:
         try:
             table = await self.get_table()
 
+            # Read the clock once so both boundaries agree even across midnight
+            midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
             # Calculate today's start as a formatted string
-            today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).strftime(
-                '%Y-%m-%d %H:%M:%S')
+            today_start = midnight.strftime('%Y-%m-%d %H:%M:%S')
 
             # Calculate yesterday's timestamp (for resetting messages)
-            # Correct import of timedelta
-            from datetime import timedelta
-            yesterday = (datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) -
-                         timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S')
+            yesterday = (midnight - timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S')
 
             # Query all user sessions
             sessions_response = await table.query(
@@ -1,4 +1,3 @@
-import requests
 import json
 from typing import Iterator, Any
 from .base import BaseLLMProvider
@@ -26,7 +25,7 @@ class AzureOpenAIProvider(BaseLLMProvider):
             **kwargs,
         }
 
-        response = requests.post(url, headers=headers, json=payload)
+        response = self.session.post(url, headers=headers, json=payload)
         response.raise_for_status()
         return response.json()
 
@@ -45,7 +44,7 @@ class AzureOpenAIProvider(BaseLLMProvider):
             **kwargs,
         }
 
-        with requests.post(url, headers=headers, json=payload, stream=True) as response:
+        with self.session.post(url, headers=headers, json=payload, stream=True) as response:
             response.raise_for_status()
             for line in response.iter_lines():
                 if line:
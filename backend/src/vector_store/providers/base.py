@@ -1,7 +1,21 @@
 from abc import ABC, abstractmethod
 from typing import Iterator, Any
+import requests
+from requests.adapters import HTTPAdapter
 
 class BaseLLMProvider(ABC):
+    POOL_MAXSIZE = 32
+
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session shared by all calls so keep-alive connections are reused"""
+        session = getattr(self, "_session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_maxsize=self.POOL_MAXSIZE))
+            self._session = session
+        return session
+
     @abstractmethod
     def prepare_client(self):
         pass
@@ -1,4 +1,3 @@
-import requests
 import json
 from typing import Iterator, Any
 from .base import BaseLLMProvider
@@ -51,11 +50,14 @@ class ClaudeProvider(BaseLLMProvider):
             **kwargs,
         }
 
-        response = requests.post(self.base_url, headers=headers, json=payload)
+        response = self.session.post(self.base_url, headers=headers, json=payload)
         response.raise_for_status()
         
         # Convert Claude response to OpenAI format
         claude_response = response.json()
+        usage = claude_response.get("usage") or {}
+        output_tokens = usage.get("output_tokens", 0)
+        input_tokens = usage.get("input_tokens", 0)
         return {
             "choices": [{
                 "message": {
@@ -64,12 +66,9 @@ class ClaudeProvider(BaseLLMProvider):
                 }
             }],
             "usage": {
-                "completion_tokens": claude_response.get("usage", {}).get("output_tokens", 0),
-                "prompt_tokens": claude_response.get("usage", {}).get("input_tokens", 0),
-                "total_tokens": (
-                    claude_response.get("usage", {}).get("output_tokens", 0) +
-                    claude_response.get("usage", {}).get("input_tokens", 0)
-                )
+                "completion_tokens": output_tokens,
+                "prompt_tokens": input_tokens,
+                "total_tokens": output_tokens + input_tokens
             }
         }
 
@@ -90,7 +89,7 @@ class ClaudeProvider(BaseLLMProvider):
             **kwargs,
         }
 
-        with requests.post(self.base_url, headers=headers, json=payload, stream=True) as response:
+        with self.session.post(self.base_url, headers=headers, json=payload, stream=True) as response:
             response.raise_for_status()
             for line in response.iter_lines():
                 if line:
@@ -1,4 +1,3 @@
-import requests
 import json
 from typing import Iterator, Any
 from .base import BaseLLMProvider
@@ -25,7 +24,7 @@ class OpenAIProvider(BaseLLMProvider):
             **kwargs,
         }
 
-        response = requests.post(self.base_url, headers=headers, json=payload)
+        response = self.session.post(self.base_url, headers=headers, json=payload)
         response.raise_for_status()
         return response.json()
 
@@ -43,7 +42,7 @@ class OpenAIProvider(BaseLLMProvider):
             **kwargs,
         }
 
-        with requests.post(self.base_url, headers=headers, json=payload, stream=True) as response:
+        with self.session.post(self.base_url, headers=headers, json=payload, stream=True) as response:
             response.raise_for_status()
             for line in response.iter_lines():
                 if line:
@@ -1,7 +1,6 @@
 import asyncio
 from typing import AsyncIterator, Iterator, Optional, Any, Tuple, List
 from openai import OpenAI
-from qdrant_client import QdrantClient
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
@@ -13,8 +12,17 @@ from config.logging_config import info, error, debug, warning
 
 from .providers import BaseLLMProvider, OpenAIProvider, AzureOpenAIProvider, ClaudeProvider
 from .dynamo_db_crud import DynamoDBManager
+from .chunk_store import get_qdrant_client
 from config.config import OPENAI_API_KEY
 
+def _delta_content(chunk_data: dict) -> Optional[str]:
+    """Text carried by one streamed completion chunk, if any"""
+    choices = chunk_data.get("choices")
+    if not choices:
+        return None
+    delta = choices[0].get("delta")
+    return delta.get("content") if delta else None
+
 
 # Message Classes for OpenAI Chat Format
 class BaseMessage:
@@ -69,17 +77,15 @@ class ChatLLM:
         provider: BaseLLMProvider,
         qdrant_url: str, 
         qdrant_api_key: str,
+        dynamo_db: Optional[DynamoDBManager] = None,
     ):
         self.provider = provider
         self.provider.prepare_client()
               
         # Initialize Qdrant client
         try:
-            self.qdrant_client = QdrantClient(
-                url=qdrant_url,
-                api_key=qdrant_api_key
-            )
-            self.dynamo_db = DynamoDBManager()
+            self.qdrant_client = get_qdrant_client(qdrant_url, qdrant_api_key)
+            self.dynamo_db = dynamo_db or DynamoDBManager()
         except Exception as e:
             raise Exception(f"Failed to initialize Qdrant client: {str(e)}")
 
@@ -159,16 +165,18 @@ class ChatLLM:
             contexts = []
 
             for r in search_result:
+                metadata = r.payload.get('metadata', {})
+                file_name = os.path.basename(metadata.get('file_path', ''))
                 # Add the file basename to source_attributes list
-                source_attributes.append(os.path.basename(r.payload.get('metadata', {}).get('file_path', '')))
+                source_attributes.append(file_name)
                 
                 # Create context string
                 contexts.append(
                     f"content: {r.payload.get('content', '')}, "
-                    f"type: {r.payload.get('metadata', {}).get('type', 'unknown')}, "
-                    f"file: {os.path.basename(r.payload.get('metadata', {}).get('file_path', ''))}, "
-                    f"dependencies: {r.payload.get('metadata', {}).get('dependencies', [])}, "
-                    f"imports: {r.payload.get('metadata', {}).get('imports', [])}"
+                    f"type: {metadata.get('type', 'unknown')}, "
+                    f"file: {file_name}, "
+                    f"dependencies: {metadata.get('dependencies', [])}, "
+                    f"imports: {metadata.get('imports', [])}"
                 )
             
             return contexts, list(set(source_attributes))
@@ -205,7 +213,9 @@ class ChatLLM:
         else:
             user_context = None
         
-        contexts, source_attributes = self.get_context_from_qdrant(ast_flag, collection_name, query, limit)
+        contexts, source_attributes = await asyncio.to_thread(
+            self.get_context_from_qdrant, ast_flag, collection_name, query, limit
+        )
         
         if len(sys_prompt.strip()) != 0:
             system_prompt = sys_prompt + "\nContext:\n"
@@ -303,7 +313,8 @@ class ChatLLM:
         )
         
         try:
-            response_data = self.provider.invoke(
+            response_data = await asyncio.to_thread(
+                self.provider.invoke,
                 messages=self.prepare_message(messages),
                 temperature=temperature,
                 **kwargs
@@ -366,21 +377,21 @@ class ChatLLM:
             
             # If it's a regular generator (not an async generator), convert it to async
             if not hasattr(stream_response, '__aiter__'):
-                # Process as a regular generator using to_thread
-                for chunk_data in stream_response:
-                    if chunk_data.get("choices"):
-                        content = chunk_data["choices"][0].get("delta", {}).get("content")
-                        if content:
-                            yield contexts, LLMInterface(content=content)
-                    # Give other tasks a chance to run
-                    await asyncio.sleep(0)
+                # Pull each chunk in a worker thread so the blocking HTTP read never stalls the event loop
+                stream_iterator = iter(stream_response)
+                while True:
+                    chunk_data = await asyncio.to_thread(next, stream_iterator, None)
+                    if chunk_data is None:
+                        break
+                    content = _delta_content(chunk_data)
+                    if content:
+                        yield contexts, LLMInterface(content=content)
             else:
                 # Process as an async generator
                 async for chunk_data in stream_response:
-                    if chunk_data.get("choices"):
-                        content = chunk_data["choices"][0].get("delta", {}).get("content")
-                        if content:
-                            yield contexts, LLMInterface(content=content)
+                    content = _delta_content(chunk_data)
+                    if content:
+                        yield contexts, LLMInterface(content=content)
             
             # After all chunks, yield source information
             yield contexts, LLMInterface(content=f"\nSource files: {', '.join(source_attributes)}")